@@ -0,0 +1,213 @@
+import os
+import re
+import io
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import contextlib
+import subprocess
+import openpyxl
+from datetime import datetime, timedelta
+import SCCREAD
+import SCCCHECK
+import KAIZEN
+
+def build_title_sheet(long_cells=20, cell_length=400): # builds an in-memory title page that looks like the ones on real SCCs
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    filler = "This checklist applies to the production and disaster recovery servers managed by the platform team. "
+
+    sheet.cell(row=1, column=1, value="Security Configuration Checklist")
+    for i in range(long_cells): # long free text cells are what made the original matcher slow
+        sheet.cell(row=3 + i, column=2, value=(filler * (cell_length // len(filler) + 1))[:cell_length])
+
+    row = 4 + long_cells
+    sheet.cell(row=row, column=1, value="SCC Guidance Source: DISA STIG V2R3")
+    sheet.cell(row=row + 1, column=1, value="SCC Policy and Procedures Source: Internal Hardening Standard")
+    sheet.cell(row=row + 2, column=1, value="SCC System Scope: all Windows member servers")
+    sheet.cell(row=row + 3, column=3, value="Owner: SCM1234 - " + filler * 3)
+    return sheet
+
+def time_function(function, repeat): # best of repeat runs, in seconds
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best, result
+
+def regex_match_with_diff(pattern, text, max_diff): # the original SCCCHECK matcher, fullmatch on every slice of the cell, kept here as the baseline
+    for i in range(len(text) - max_diff + 1):
+        for j in range(i + 1, len(text) + 1):
+            if pattern.fullmatch(text[i:j]):
+                return True
+    return False
+
+def find_value_sliced(sheet, pattern, max_diff=5, max_rows=150, max_cols=50): # the original SCCCHECK.find_value_with_regex, one walk of the sheet per pattern
+    for row in sheet.iter_rows(min_row=1, max_row=max_rows, max_col=max_cols, values_only=True):
+        for cell in row:
+            if cell and regex_match_with_diff(pattern, str(cell), max_diff):
+                return str(cell)
+    return False
+
+def benchmark_title_patterns(long_cells=20, cell_length=400, repeat=3): # compares the sliced matcher with SCCCHECK.scan_title_sheet on the same title sheet
+    sheet = build_title_sheet(long_cells, cell_length)
+    patterns = {
+        'SCM': (re.compile(r'SCM\d+', re.IGNORECASE), 0),
+        'Guidance': (re.compile(r'SCC Guidance Source', re.IGNORECASE), 5),
+        'Policy': (re.compile(r'SCC Policy and Procedures Source', re.IGNORECASE), 5),
+        'Scope': (re.compile(r'SCC System Scope', re.IGNORECASE), 3)
+    }
+
+    results = {}
+    elapsed, found = time_function(lambda: [find_value_sliced(sheet, pattern, max_diff) for pattern, max_diff in patterns.values()], repeat)
+    results['slice'] = {'seconds': elapsed, 'found': found}
+    elapsed, (matches, _) = time_function(lambda: SCCCHECK.scan_title_sheet(sheet, patterns), repeat)
+    results['search'] = {'seconds': elapsed, 'found': [matches[name] for name in patterns]}
+
+    results['same result'] = results['slice']['found'] == results['search']['found']
+    return results
+
+def write_synthetic_scc(file_path, rows=1000, sheets=1, seed=0): # writes an SCC workbook shaped like the ones SCCREAD/SCCCHECK expect
+    rng = random.Random(seed)
+    workbook = openpyxl.Workbook()
+    title_sheet = workbook.active
+    title_sheet.title = "Title Page"
+    title_sheet.cell(row=1, column=1, value="Security Configuration Checklist")
+    title_sheet.cell(row=3, column=1, value="SCM Name:")
+    title_sheet.cell(row=3, column=2, value=f"SCM{rng.randint(1000, 9999)}")
+    title_sheet.cell(row=4, column=1, value="SCC Guidance Source: DISA STIG V2R3")
+    title_sheet.cell(row=5, column=1, value="SCC Policy and Procedures Source: Internal Hardening Standard")
+    title_sheet.cell(row=6, column=1, value="SCC System Scope: all member servers")
+    title_sheet.cell(row=8, column=1, value="Review Date")
+    title_sheet.cell(row=8, column=2, value=datetime.now() - timedelta(days=rng.randint(0, 365)))
+
+    doc_names = [f"WPS Supporting Document {n:03d}" for n in range(40)]
+    for sheet_number in range(sheets):
+        sheet = workbook.create_sheet(f"Checklist {sheet_number + 1}")
+        sheet.append(["STIG ID", "Configuration", "Exception ID", "Compliance Method", "Documentation", "TLA"])
+        for row_number in range(rows):
+            exception = f"BPER{rng.randint(0, 9999999):07d}" if rng.random() < 0.05 else None
+            documentation = rng.choice([
+                None,
+                "N/A",
+                rng.choice(doc_names),
+                f"{rng.choice(doc_names)}    {rng.choice(doc_names)}",
+                f"{rng.choice(doc_names)}\n{rng.randint(100000, 999999)}"
+            ])
+            sheet.append([
+                f"STIG-{sheet_number + 1}-{row_number + 1:05d}",
+                "Setting configured per the STIG",
+                exception,
+                rng.choice(["Manual", "Automated", "N/A"]),
+                documentation,
+                "TLA" if exception and rng.random() < 0.2 else None
+            ])
+    workbook.save(file_path)
+
+def generate_scc_set(directory, sccs=10, rows=1000, sheets=1): # a directory of synthetic SCCs, named the way real ones are (NAME_VV.xlsx)
+    os.makedirs(directory, exist_ok=True)
+    file_paths = []
+    for scc_number in range(sccs):
+        file_path = os.path.join(directory, f"TEAM{scc_number:03d}_SCC_{scc_number % 90 + 10:02d}.xlsx")
+        write_synthetic_scc(file_path, rows, sheets, seed=scc_number)
+        file_paths.append(file_path)
+    return file_paths
+
+def time_quietly(function, repeat): # time_function with the progress prints from the SCC modules swallowed
+    with contextlib.redirect_stdout(io.StringIO()):
+        return time_function(function, repeat)
+
+def benchmark_ingestion(sccs=10, rows=1000, sheets=1, workers=1, repeat=3): # times SCCREAD, SCCCHECK and a full progress.json build on synthetic SCCs
+    work_dir = tempfile.mkdtemp(prefix='kaizen_bench_')
+    try:
+        scc_dir = os.path.join(work_dir, 'SCCs')
+        file_paths = generate_scc_set(scc_dir, sccs, rows, sheets)
+
+        read_seconds, _ = time_quietly(lambda: [SCCREAD.process_excel_file(file_path) for file_path in file_paths], repeat)
+        check_seconds, _ = time_quietly(lambda: [SCCCHECK.process_scc_file(file_path) for file_path in file_paths], repeat)
+
+        build_runs = []
+        def build(): # every run gets an empty project directory so the SCC cache starts cold
+            project_dir = os.path.join(work_dir, f'project_{len(build_runs)}')
+            os.makedirs(project_dir)
+            build_runs.append(project_dir)
+            KAIZEN.build_progress_json(scc_dir, project_dir, workers)
+        build_seconds, _ = time_quietly(build, repeat)
+        cached_seconds, _ = time_quietly(lambda: KAIZEN.build_progress_json(scc_dir, build_runs[-1], workers), repeat) # warm cache, nothing changed
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return {
+        'SCCREAD.process_excel_file': read_seconds,
+        'SCCCHECK.process_scc_file': check_seconds,
+        'KAIZEN.build_progress_json': build_seconds,
+        'KAIZEN.build_progress_json (cached)': cached_seconds
+    }
+
+def get_code_version(): # git commit of the code being measured, if there is one
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+def compare_results(old_results, new_results): # prints old vs new seconds for every timing both runs have
+    print(f"Comparing {old_results.get('Version', 'unknown')} -> {new_results.get('Version', 'unknown')}")
+    for name, new_seconds in new_results['Timings'].items():
+        old_seconds = old_results.get('Timings', {}).get(name)
+        if old_seconds:
+            print(f"  {name}: {old_seconds:.4f}s -> {new_seconds:.4f}s ({old_seconds / new_seconds:.2f}x)")
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark SCC parsing.')
+    parser.add_argument('--sccs', type=int, default=10, help='Number of synthetic SCCs')
+    parser.add_argument('--rows', type=int, default=1000, help='Rows per checklist sheet')
+    parser.add_argument('--sheets', type=int, default=1, help='Checklist sheets per SCC')
+    parser.add_argument('--workers', type=int, default=1, help='Worker processes for build_progress_json')
+    parser.add_argument('--long-cells', type=int, default=20, help='Number of long text cells on the title sheet')
+    parser.add_argument('--cell-length', type=int, default=400, help='Length of each long text cell')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per timing, best is kept')
+    parser.add_argument('--skip-title', action='store_true', help='Skip the title page pattern comparison')
+    parser.add_argument('--output', type=str, help='Write the results to this JSON file')
+    parser.add_argument('--compare', type=str, help='JSON results from an earlier run to compare against')
+    args = parser.parse_args()
+
+    results = {
+        'Version': get_code_version(),
+        'Date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'Python': platform.python_version(),
+        'Settings': {'sccs': args.sccs, 'rows': args.rows, 'sheets': args.sheets, 'workers': args.workers, 'repeat': args.repeat},
+        'Timings': {}
+    }
+
+    if not args.skip_title:
+        title_results = benchmark_title_patterns(args.long_cells, args.cell_length, args.repeat)
+        print(f"Title page patterns ({args.long_cells} cells of {args.cell_length} characters):")
+        print(f"  slice:  {title_results['slice']['seconds']:.4f}s")
+        print(f"  search: {title_results['search']['seconds']:.4f}s")
+        print(f"  same result: {title_results['same result']}")
+        results['Timings']['Title patterns (slice)'] = title_results['slice']['seconds']
+        results['Timings']['Title patterns (search)'] = title_results['search']['seconds']
+
+    print(f"Ingestion ({args.sccs} SCCs x {args.sheets} sheet(s) x {args.rows} rows, {args.workers} worker(s)):")
+    for name, seconds in benchmark_ingestion(args.sccs, args.rows, args.sheets, args.workers, args.repeat).items():
+        print(f"  {name}: {seconds:.4f}s")
+        results['Timings'][name] = seconds
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=4)
+        print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r') as file:
+            compare_results(json.load(file), results)
+
+if __name__ == "__main__":
+    main()
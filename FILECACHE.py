@@ -0,0 +1,99 @@
+import os
+import json
+import hashlib
+import argparse
+
+def get_file_hash(file_path): # sha256 of the file contents, read in chunks so big files don't sit in memory
+    file_hash = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b''):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+def get_memo_hash(hash_memo, file_path): # get_file_hash, but each file is only hashed once per run, keyed by size and mtime too so a file changed part way through is hashed again
+    if hash_memo is None:
+        return get_file_hash(file_path)
+    stat = os.stat(file_path)
+    memo_key = (get_cache_key(file_path), stat.st_size, stat.st_mtime_ns)
+    if memo_key not in hash_memo:
+        hash_memo[memo_key] = get_file_hash(file_path)
+    return hash_memo[memo_key]
+
+def get_cache_key(file_path): # the same file always gets the same key, however the path was written
+    return os.path.normcase(os.path.abspath(file_path))
+
+def get_fingerprint(file_path): # size, mtime and sha256, what the caches and manifests store to tell if a file changed
+    stat = os.stat(file_path)
+    return {'size': stat.st_size, 'mtime': stat.st_mtime, 'hash': get_file_hash(file_path)}
+
+def is_unchanged(file_path, fingerprint): # checks size/mtime first and only hashes if those moved, a file touched without changing keeps its fingerprint with the new mtime
+    try:
+        stat = os.stat(file_path)
+    except OSError: # missing
+        return False
+    if fingerprint['size'] != stat.st_size:
+        return False
+    if fingerprint['mtime'] == stat.st_mtime:
+        return True
+    if fingerprint['hash'] == get_file_hash(file_path):
+        fingerprint['mtime'] = stat.st_mtime
+        return True
+    return False
+
+def load_json(file_path, default, description): # contents of a cache or manifest file, default if it's missing or unreadable
+    if os.path.exists(file_path):
+        try:
+            with open(file_path, 'r') as file:
+                return json.load(file)
+        except (IOError, json.JSONDecodeError) as e:
+            print(f"Ignoring unreadable {description} {file_path}: {e}") # a bad cache just means the work gets done again
+    return default
+
+def save_json(file_path, data, sort_keys=False):
+    with open(file_path, 'w') as file:
+        json.dump(data, file, indent=4, sort_keys=sort_keys)
+
+def load_cache(cache_path, entries_key, description, versions=None): # a cache of per-file results keyed by fingerprint, versions are saved with it and entries saved under any other versions are thrown out, hit/miss counters start at 0 for every run
+    versions = versions or {}
+    cache_data = load_json(cache_path, {}, description) # a bad cache just means the work gets done again
+    entries = cache_data.get(entries_key, {}) if all(cache_data.get(name) == version for name, version in versions.items()) else {}
+    return {'path': cache_path, 'key': entries_key, 'description': description, 'versions': versions, 'entries': entries, 'hits': 0, 'misses': 0}
+
+def save_cache(cache):
+    save_json(cache['path'], {**cache['versions'], cache['key']: cache['entries']})
+    print(f"{cache['description']}: {cache['hits']} hits, {cache['misses']} misses")
+
+def find_entry(cache, file_path): # the cached entry if the file hasn't changed, a file rewritten with the same contents still counts
+    entry = cache['entries'].get(get_cache_key(file_path))
+    return entry if entry is not None and is_unchanged(file_path, entry) else None
+
+def new_entry(cache, file_path): # fresh entry for a new or changed file, replacing anything stored before
+    entry = get_fingerprint(file_path)
+    cache['entries'][get_cache_key(file_path)] = entry
+    return entry
+
+def get_entry(cache, file_path):
+    return find_entry(cache, file_path) or new_entry(cache, file_path)
+
+def invalidate(cache, file_paths=None): # drop the given files from the cache, or everything if none are given
+    if not file_paths:
+        removed = len(cache['entries'])
+        cache['entries'] = {}
+        return removed
+
+    removed = 0
+    for file_path in file_paths:
+        if cache['entries'].pop(get_cache_key(file_path), None) is not None:
+            removed += 1
+    return removed
+
+def invalidate_from_command_line(load_project_cache, kind): # for clearing a cache from the command line, load_project_cache(project_dir) is the cache module's own loader
+    parser = argparse.ArgumentParser(description=f'Invalidate cached results for {kind} files.')
+    parser.add_argument('project_dir', type=str, help='Project directory holding progress.json')
+    parser.add_argument('file_paths', type=str, nargs='*', help=f'{kind} files to invalidate, all of them if left out')
+    args = parser.parse_args()
+
+    cache = load_project_cache(args.project_dir)
+    removed = invalidate(cache, args.file_paths)
+    save_cache(cache)
+    print(f"Removed {removed} cached {kind}(s) from {cache['path']}")
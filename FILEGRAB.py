@@ -6,108 +6,581 @@ import argparse
 import json
 import fitz
 import sys
+import queue
+import threading
+import bisect
+import hashlib
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
 from difflib import SequenceMatcher
+import FILECACHE
 from datetime import datetime
+try:
+    import fcntl # only used for reflinks, not available on Windows
+except ImportError:
+    fcntl = None
+
+doc_extensions = ('.docx', '.doc', '.xlsx', '.xls', '.pdf') # file types accepted as supporting documents
+default_copy_workers = 8 # default number of files copied at once during gather
+placement_modes = ('copy', 'hardlink', 'symlink', 'reflink') # how gathered files are put in the SCC folders, 'Placement Mode' in Program Settings
+placement_verbs = {'copy': 'Copied', 'hardlink': 'Hardlinked', 'symlink': 'Symlinked', 'reflink': 'Reflinked', 'manifest': 'Listed'}
+evidence_store_dirname = 'Evidence Store' # each unique file is kept once here by hash when 'Evidence Store' is on in Program Settings
+manifest_filename = 'evidence_manifest.json' # written into each SCC folder built from the evidence store
+FICLONE = 0x40049409 # linux ioctl for copy-on-write clones
+mtime_tolerance = 2 # seconds, FAT drives and some network shares only keep even seconds
+bper_date_pattern = re.compile(r"Valid To:\s*(\d{4}-\d{2}-\d{2}) \d{2}:\d{2}:\d{2}")
+bper_status_pattern = re.compile(r"State:\s*(\S+)")
+bper_tla_pattern = re.compile(r"Technical Limitation")
+bper_page_overlap = 256 # characters of the text so far searched again with the next page
+bper_extractor_version = 1 # bump when extract_BPER_info changes what it returns, PDFCACHE drops the old results
+attestation_extractor_version = 1 # same for extract_attestation_pdf_info/extract_attest_info
+
+def index_directory(directory, recursive=False, extensions=None): # one os.scandir pass over a source directory, so lookups don't go back to the disk (or network share) every time, recursive also indexes every subfolder
+    files = {}
+    duplicates = {}
+    folders = 0
+    pending = deque([(directory, '')])
+    while pending: # breadth first, so shallower files are indexed before deeper ones
+        current, relative = pending.popleft()
+        try:
+            with os.scandir(current) as scan:
+                entries = sorted(scan, key=lambda entry: entry.name) if recursive else list(scan) # sorted so the duplicate policy doesn't depend on the file system's order
+        except OSError as e:
+            print(f"Unable to read directory {current}: {e}")
+            continue
+        folders += 1
+
+        for entry in entries:
+            try:
+                if recursive and entry.is_dir(follow_symlinks=False): # linked folders aren't followed, they can loop
+                    pending.append((entry.path, os.path.join(relative, entry.name)))
+                    continue
+                if not entry.is_file():
+                    continue
+                ext = os.path.splitext(entry.name)[1].lower()
+                if extensions and ext not in extensions:
+                    continue
+                stat = entry.stat()
+            except OSError:
+                continue
+
+            key = os.path.normcase(entry.name) # normcase so lookups behave like the file system does
+            relpath = os.path.join(relative, entry.name)
+            if key in files: # same file name in two folders, the shallowest one wins and ties go to the first path in name order
+                duplicates.setdefault(key, []).append(relpath)
+                continue
+            files[key] = {
+                'name': entry.name,
+                'path': entry.path,
+                'relpath': relpath,
+                'ext': ext,
+                'size': stat.st_size,
+                'mtime': stat.st_mtime
+            }
+
+    if recursive:
+        print(f"Indexed {len(files)} files in {folders} folders under {directory}, {len(duplicates)} duplicate names skipped")
+    return {'directory': directory, 'files': files, 'duplicates': duplicates}
+
+def build_directory_indexes(base_directories, recursive=False): # index each source directory once per run, a recursive scan only keeps the file types gathering accepts
+    extensions = doc_extensions if recursive else None
+    return {key: index_directory(directory, recursive, extensions) for key, directory in base_directories.items() if directory}
+
+def find_indexed_file(directory_index, file_name): # path of file_name if it's in the index, otherwise None
+    file_info = directory_index['files'].get(os.path.normcase(file_name))
+    return file_info['path'] if file_info else None
+
+def list_indexed_files(directory_index, extensions=doc_extensions, ignore_case=True): # file names in the index with one of the extensions, in directory order
+    if ignore_case:
+        return [file_info['name'] for file_info in directory_index['files'].values() if file_info['ext'] in extensions]
+    return [file_info['name'] for file_info in directory_index['files'].values() if file_info['name'].endswith(extensions)]
+
+def build_match_index(file_names, ignore_case=True): # length and character count index over candidate file names, for find_best_match
+    keys = [name.lower() if ignore_case else name for name in file_names]
+    return {
+        'names': list(file_names),
+        'keys': keys,
+        'ignore case': ignore_case,
+        'fingerprint': hashlib.sha1('\n'.join(file_names).encode('utf-8')).hexdigest(), # changes whenever a candidate file is added, removed or renamed
+        'counts': [Counter(key) for key in keys],
+        'by length': sorted((len(key), position) for position, key in enumerate(keys)) # (length, position) so a length range is one bisect
+    }
+
+def find_best_match(match_index, name, threshold=0.8): # same answer as max(SequenceMatcher ratio) over every file, only the files that could reach the threshold get a full SequenceMatcher run
+    key = name.lower() if match_index['ignore case'] else name
+    key_length = len(key)
+    if not match_index['names']:
+        return None, 0
+
+    # ratio is 2*matches/total, and matches can't be more than the shorter length or the shared character counts, so both give an upper bound
+    min_length = int(key_length * threshold / (2 - threshold))
+    max_length = int(key_length * (2 - threshold) / threshold) + 1
+    start = bisect.bisect_left(match_index['by length'], (min_length, -1))
+    end = bisect.bisect_right(match_index['by length'], (max_length, len(match_index['names'])))
+
+    key_counts = Counter(key)
+    shortlist = []
+    for candidate_length, position in match_index['by length'][start:end]:
+        total = key_length + candidate_length
+        if not total or 2.0 * min(key_length, candidate_length) / total < threshold:
+            continue
+        shared = sum((key_counts & match_index['counts'][position]).values())
+        if 2.0 * shared / total >= threshold:
+            shortlist.append(position)
+
+    best_position = None
+    best_ratio = 0
+    for position in sorted(shortlist): # directory order, so ties go to the same file max() would pick
+        ratio = SequenceMatcher(None, key, match_index['keys'][position]).ratio()
+        if ratio > best_ratio:
+            best_position, best_ratio = position, ratio
+
+    if best_position is None or best_ratio < threshold:
+        return None, best_ratio
+    return match_index['names'][best_position], best_ratio
+
+def find_cached_match(match_cache, match_index, name, threshold=0.8): # find_best_match, reusing the stored result while the directory's file names haven't changed
+    cached_matches = match_cache.setdefault(name, []) # gathering and pulling match differently (case), so a name can have an entry for each
+    for cached in cached_matches:
+        if cached.get('Ignore case') == match_index['ignore case'] and cached.get('Threshold') == threshold:
+            if cached.get('Directory') == match_index['fingerprint']:
+                return cached['File'], cached['Ratio']
+            cached_matches.remove(cached) # stale, the directory changed since it was matched
+            break
+
+    best_match, match_ratio = find_best_match(match_index, name, threshold)
+    cached_matches.append({
+        'Doc name': name,
+        'File': best_match,
+        'Ratio': match_ratio,
+        'Ignore case': match_index['ignore case'],
+        'Threshold': threshold,
+        'Directory': match_index['fingerprint']
+    })
+    return best_match, match_ratio
+
+def resolve_sources(bper_dict, doc_dict, attestation_dict, base_directories, directory_indexes=None, match_cache=None, cancel_event=None): # finds the source file for every item, nothing is copied and the dictionaries aren't changed, match_cache is the 'Document Matches' dict from progress.json, stops early once cancel_event is set
+    if match_cache is None:
+        match_cache = {}
+    if directory_indexes is None:
+        directory_indexes = build_directory_indexes(base_directories) # source directories are listed once, not once per item
+    doc_files = list_indexed_files(directory_indexes['doc']) if 'doc' in directory_indexes else []
+    doc_match_index = build_match_index(doc_files) # built once, every document name is matched against it
+    resolved = []
+
+    def add(item_dict, value, source_file_path, action, reason, message=None):
+        resolved.append({'items': item_dict, 'value': value, 'source': source_file_path, 'action': action, 'reason': reason, 'message': message})
 
-def update_dictionaries_and_copy_files(bper_dict, doc_dict, attestation_dict, base_directories, master_directory): # goes through lists, and sets up for copy_and_update
     for key, value_list in bper_dict.items(): # BPER list
+        if cancel_event is not None and cancel_event.is_set(): # items not resolved yet aren't planned, so they're left as they are
+            return resolved
         value = value_list[0]  
         if value.get('false_positive', False):
-            print(f"Skipping BPER '{key}' marked as false positive.") # skip false pos
+            add(bper_dict, value, None, 'false positive', 'marked as false positive', f"Skipping BPER '{key}' marked as false positive.") # skip false pos
             continue
 
         if 'manually_linked' in value:
             source_file_path = value['manually_linked'] # use the path stored in manually_linked if present
+            if not os.path.isfile(source_file_path):
+                source_file_path = None
+            reason = 'manually linked'
         else:
-            source_directory = base_directories['bper']
-            source_file_path = os.path.join(source_directory, f"{key}.pdf") # otherwise creates the path, expects only pdf, BPER names should match exactly
+            source_file_path = find_indexed_file(directory_indexes['bper'], f"{key}.pdf") # otherwise look it up, expects only pdf, BPER names should match exactly
+            reason = 'exact name'
 
-        if os.path.isfile(source_file_path):
-            bper_dict = copy_and_update(value, source_file_path, master_directory, bper_dict, use_margin_for_error=False) # if file is present, copy it over
+        if source_file_path:
+            add(bper_dict, value, source_file_path, 'gather', reason) # if file is present, copy it over
         else:
-            value['Gathered'] = False
-            print(f"File not found for BPER: {key}") # not found, print outcome
+            add(bper_dict, value, None, 'not found', reason, f"File not found for BPER: {key}") # not found, print outcome
 
     for key, value_list in doc_dict.items(): # Supporting Docs list
+        if cancel_event is not None and cancel_event.is_set(): # matching is the slow part of planning
+            return resolved
         value = value_list[0]  
         if value.get('false_positive', False):
-            print(f"Skipping Document '{value['Doc name']}' marked as false positive.") # skip false pos
+            add(doc_dict, value, None, 'false positive', 'marked as false positive', f"Skipping Document '{value['Doc name']}' marked as false positive.") # skip false pos
             continue
 
         if 'manually_linked' in value:
             source_file_path = value['manually_linked'] # use the path stored in manually_linked if present
+            if not os.path.isfile(source_file_path):
+                source_file_path = None
+            reason = 'manually linked'
         else:
-            source_directory = base_directories['doc']
             doc_name = value['Doc name']
             # Needs to match because of doc names are all over the place
-            matching_files = [f for f in os.listdir(source_directory) if (f.lower().endswith('.docx') or f.lower().endswith('.doc') or f.lower().endswith('.xlsx') or f.lower().endswith('.xls') or f.lower().endswith('.pdf'))]
+            matching_files = doc_files
             if matching_files:
-                best_match = max(matching_files, key=lambda x: SequenceMatcher(None, doc_name.lower(), x.lower()).ratio())
-                match_ratio = SequenceMatcher(None, doc_name.lower(), best_match.lower()).ratio()
-                if match_ratio >= 0.8:  # threshold feeds into SequenceMatcher, basically closeness of match
-                    source_file_path = os.path.join(source_directory, best_match)
+                best_match, match_ratio = find_cached_match(match_cache, doc_match_index, doc_name, 0.8) # threshold feeds into SequenceMatcher, basically closeness of match
+                if best_match:
+                    source_file_path = find_indexed_file(directory_indexes['doc'], best_match) # the index knows which subfolder it's in after a recursive scan
+                    reason = f"matched {match_ratio:.2f}"
                 else:
-                    value['Gathered'] = False
-                    print(f"No close match found for Document: {doc_name}") # not found, ratio is below the match_ratio
+                    add(doc_dict, value, None, 'not found', f"best match {match_ratio:.2f}", f"No close match found for Document: {doc_name}") # not found, ratio is below the match_ratio
                     continue
             else:
-                value['Gathered'] = False
-                print(f"No matching file found for Document: {doc_name}") # not found at all
+                add(doc_dict, value, None, 'not found', 'no documents', f"No matching file found for Document: {doc_name}") # not found at all
                 continue
 
-        if os.path.isfile(source_file_path): # when appropriate match is found, copy it over, update the dictionary
-            doc_dict = copy_and_update(value, source_file_path, master_directory, doc_dict, use_margin_for_error=True)
+        if source_file_path: # when appropriate match is found, copy it over, update the dictionary
+            add(doc_dict, value, source_file_path, 'gather', reason)
         else:
-            value['Gathered'] = False
-            print(f"File not found for Document: {value['Doc name']}") # not found at all
+            add(doc_dict, value, None, 'not found', reason, f"File not found for Document: {value['Doc name']}") # not found at all
 
     for key, value_list in attestation_dict.items(): # Attestation list
+        if cancel_event is not None and cancel_event.is_set():
+            return resolved
         value = value_list[0]  
         if value.get('false_positive', False):
-            print(f"Skipping Attestation '{key}' marked as false positive.") # skip false pos
+            add(attestation_dict, value, None, 'false positive', 'marked as false positive', f"Skipping Attestation '{key}' marked as false positive.") # skip false pos
             continue
 
         if 'manually_linked' in value:
             source_file_path = value['manually_linked'] # use manually_linked if present
+            if not os.path.isfile(source_file_path):
+                source_file_path = None
+            reason = 'manually linked'
         else:
-            source_directory = base_directories['attestation']
-            source_file_path = os.path.join(source_directory, f"{key}.pdf") # otherwise, use the path, only expects pdf
+            source_file_path = find_indexed_file(directory_indexes['attestation'], f"{key}.pdf") # otherwise, look it up, only expects pdf
+            reason = 'exact name'
 
-        if os.path.isfile(source_file_path):
-            attestation_dict = copy_and_update(value, source_file_path, master_directory, attestation_dict, use_margin_for_error=False) # if present, copy over and update dict
+        if source_file_path:
+            add(attestation_dict, value, source_file_path, 'gather', reason) # if present, copy over and update dict
         else:
-            value['Gathered'] = False
-            print(f"File not found for Attestation: {key}") # not found, print outcome
-
+            add(attestation_dict, value, None, 'not found', reason, f"File not found for Attestation: {key}") # not found, print outcome
+
+    return resolved
+
+def new_plan(master_directory, placement_mode='copy', verify_hash=False, evidence_store=False): # an empty gather plan with the settings the copies will run with
+    return {
+        'items': [],
+        'copy jobs': [],
+        'manifests': {},
+        'placement mode': placement_mode,
+        'verify hash': verify_hash,
+        'store dir': get_store_dir(master_directory) if evidence_store else None,
+        'hashes': {} # FILECACHE.get_memo_hash memo shared by planning and the copies, a source going to many folders is hashed once
+    }
+
+def add_to_plan(plan, resolved_item, master_directory): # adds one resolved item, with the action and reason for every destination it would be copied to
+    plan['items'].append(resolved_item)
+    resolved_item['copy jobs'] = []
+    if resolved_item['action'] != 'gather':
+        return
+
+    for copy_job in plan_copy_jobs(resolved_item['value'], resolved_item['source'], master_directory, resolved_item['items']):
+        if plan['store dir']:
+            directory = os.path.dirname(copy_job['dest'])
+            if directory not in plan['manifests']:
+                plan['manifests'][directory] = load_manifest(directory)
+            copy_job['manifest entry'] = plan['manifests'][directory].get(os.path.basename(copy_job['dest']))
+        try:
+            check_copy_job(copy_job, plan)
+        except OSError as e: # the source went missing after it was found, the copy will report it
+            copy_job.update({'action': 'copy', 'reason': f"could not check: {e}", 'bytes': 0})
+        resolved_item['copy jobs'].append(copy_job)
+        plan['copy jobs'].append(copy_job)
+
+def plan_gather(bper_dict, doc_dict, attestation_dict, base_directories, master_directory, directory_indexes=None, match_cache=None, placement_mode='copy', verify_hash=False, evidence_store=False, cancel_event=None): # resolves every source and checks every destination, only reads the disk, a cancelled plan just stops short
+    plan = new_plan(master_directory, placement_mode, verify_hash, evidence_store)
+    for resolved_item in resolve_sources(bper_dict, doc_dict, attestation_dict, base_directories, directory_indexes, match_cache, cancel_event):
+        if cancel_event is not None and cancel_event.is_set(): # checking destinations can mean hashing them
+            break
+        add_to_plan(plan, resolved_item, master_directory)
+    return plan
+
+def check_copy_job(copy_job, plan): # sets the planned action (copy, refresh or skip), the reason and the bytes it would write
+    source_file_path = copy_job['source']
+    dest_file_path = copy_job['dest']
+    source_size = os.stat(source_file_path).st_size
+
+    if plan['store dir']:
+        manifest_entry = copy_job.get('manifest entry')
+        file_hash, store_path, view_current = check_store_view(source_file_path, dest_file_path, plan['store dir'], manifest_entry, plan['verify hash'], plan['hashes'])
+        copy_job['hash'] = file_hash
+        if view_current:
+            copy_job.update({'action': 'skip', 'reason': 'up to date', 'bytes': 0})
+            return
+        stored_hashes = plan.setdefault('planned hashes', set()) # store files already planned in this run aren't counted twice
+        copy_job['bytes'] = 0 if os.path.exists(store_path) or file_hash in stored_hashes else source_size
+        stored_hashes.add(file_hash)
+        if not manifest_entry and not os.path.lexists(dest_file_path):
+            copy_job.update({'action': 'copy', 'reason': 'not gathered yet'})
+        else:
+            copy_job.update({'action': 'refresh', 'reason': 'source changed' if manifest_entry and manifest_entry['hash'] != file_hash else 'view missing'})
+        return
+
+    copy_bytes = source_size if plan['placement mode'] not in ('hardlink', 'symlink') else 0 # links write nothing unless they fall back to a copy
+    if not os.path.lexists(dest_file_path):
+        copy_job.update({'action': 'copy', 'reason': 'not gathered yet', 'bytes': copy_bytes})
+    elif is_dest_current(source_file_path, dest_file_path, plan['placement mode'], plan['verify hash'], plan['hashes']):
+        copy_job.update({'action': 'skip', 'reason': 'up to date', 'bytes': 0})
+    else:
+        copy_job.update({'action': 'refresh', 'reason': 'destination out of date', 'bytes': copy_bytes})
+
+def summarize_plan(plan): # totals for a dry run
+    summary = {'gather': 0, 'not found': 0, 'false positive': 0, 'copy': 0, 'refresh': 0, 'skip': 0, 'bytes': 0, 'directories': 0}
+    for resolved_item in plan['items']:
+        summary[resolved_item['action']] += 1
+    for copy_job in plan['copy jobs']:
+        summary[copy_job['action']] += 1
+        summary['bytes'] += copy_job['bytes']
+    summary['directories'] = len({os.path.dirname(copy_job['dest']) for copy_job in plan['copy jobs'] if copy_job['action'] != 'skip'})
+    return summary
+
+def format_size(size): # bytes as KB/MB/GB for the dry run
+    for unit in ['bytes', 'KB', 'MB', 'GB']:
+        if size < 1024 or unit == 'GB':
+            return f"{size:.0f} {unit}" if unit == 'bytes' else f"{size:.1f} {unit}"
+        size /= 1024
+
+def print_plan_summary(plan):
+    summary = summarize_plan(plan)
+    print(f"Gather plan: {summary['gather']} items found, {summary['not found']} not found, {summary['false positive']} false positives")
+    print(f"  {summary['copy']} to copy, {summary['refresh']} to refresh, {summary['skip']} up to date, across {summary['directories']} folders")
+    print(f"  Estimated {format_size(summary['bytes'])} to write ({plan['placement mode']}{', evidence store' if plan['store dir'] else ''})")
+    return summary
+
+def update_dictionaries_and_copy_files(bper_dict, doc_dict, attestation_dict, base_directories, master_directory, directory_indexes=None, match_cache=None, copy_workers=default_copy_workers, placement_mode='copy', verify_hash=False, evidence_store=False, dry_run=False, progress=None, cancel_event=None): # plans the whole gather, then runs the copies on copy_workers threads, a dry run only prints the plan totals
+    plan = plan_gather(bper_dict, doc_dict, attestation_dict, base_directories, master_directory, directory_indexes, match_cache, placement_mode, verify_hash, evidence_store, cancel_event)
+    if dry_run:
+        print_plan_summary(plan)
+    else:
+        execute_plan(plan, copy_workers, progress, cancel_event)
     return bper_dict, doc_dict, attestation_dict # output dicts for writing to progress.json
 
-def copy_and_update(entry, source_file_path, master_directory, doc_dict, use_margin_for_error=False):
-    scc_name = entry['SCC']
+def copy_and_update(entry, source_file_path, master_directory, doc_dict, use_margin_for_error=False, copy_workers=1, placement_mode='copy', verify_hash=False, evidence_store=False):
+    plan = new_plan(master_directory, placement_mode, verify_hash, evidence_store)
+    add_to_plan(plan, {'items': doc_dict, 'value': entry, 'source': source_file_path, 'action': 'gather', 'reason': 'given', 'message': None}, master_directory)
+    execute_plan(plan, copy_workers)
+    return doc_dict
+
+def get_store_dir(master_directory): # the evidence store sits in the project directory next to the SCC folders
+    return os.path.join(master_directory, evidence_store_dirname)
+
+def plan_copy_jobs(entry, source_file_path, master_directory, doc_dict): # one job per destination file, every dictionary value sharing that destination gets updated by it
     source_file_name = os.path.basename(source_file_path)
     item_name = entry.get('Doc name') or entry.get('BPER name') or entry.get('Attestation num')
 
     dest_subdir = 'Attestations' if entry.get('Attestation num') else 'Exceptions and Deviations' if entry.get('BPER name') else 'Supporting Documents'
 
+    copy_jobs = {}
     for value in doc_dict.get(item_name, []):
         dest_directory = os.path.join(master_directory, value['SCC'], dest_subdir)
-
-        if not os.path.exists(dest_directory):
-            os.makedirs(dest_directory)
-
         dest_file_path = os.path.join(dest_directory, source_file_name)
-
+        copy_job = copy_jobs.setdefault(dest_file_path, {'source': source_file_path, 'dest': dest_file_path, 'values': []})
+        copy_job['values'].append(value)
+    return list(copy_jobs.values())
+
+def clear_linked_dest(source_file_path, dest_file_path): # a link left by an earlier gather has to go first, copying over it would write through to the source or the evidence store
+    if os.path.islink(dest_file_path) or (os.path.exists(dest_file_path) and (os.stat(dest_file_path).st_nlink > 1 or os.path.samefile(source_file_path, dest_file_path))):
+        os.remove(dest_file_path)
+
+def reflink_file(source_file_path, dest_file_path): # copy-on-write clone, only Linux filesystems with FICLONE (btrfs, xfs) support it
+    if fcntl is None:
+        raise OSError("reflink is not supported on this platform")
+    with open(source_file_path, 'rb') as source_file, open(dest_file_path, 'wb') as dest_file:
+        fcntl.ioctl(dest_file.fileno(), FICLONE, source_file.fileno())
+    shutil.copystat(source_file_path, dest_file_path)
+
+def link_file(source_file_path, dest_file_path, placement_mode): # makes one link, raises if it can't be made
+    if os.path.lexists(dest_file_path):
+        os.remove(dest_file_path)
+    if placement_mode == 'hardlink':
+        os.link(source_file_path, dest_file_path) # fails across drives
+    elif placement_mode == 'symlink':
+        os.symlink(os.path.abspath(source_file_path), dest_file_path) # needs developer mode or admin on Windows
+    elif placement_mode == 'reflink':
+        reflink_file(source_file_path, dest_file_path)
+    else:
+        raise ValueError(f"unknown placement mode '{placement_mode}'")
+
+def is_dest_current(source_file_path, dest_file_path, placement_mode='copy', verify_hash=False, hash_memo=None): # True if an earlier gather already put this exact source at the destination, verify_hash also compares contents once size and mtime agree
+    if os.path.islink(dest_file_path): # symlinks only count if they were asked for and still point at the source
+        return placement_mode == 'symlink' and os.path.normcase(os.readlink(dest_file_path)) == os.path.normcase(os.path.abspath(source_file_path))
+    if not os.path.isfile(dest_file_path):
+        return False
+    if os.path.samefile(source_file_path, dest_file_path): # hardlink to the source
+        return placement_mode == 'hardlink'
+
+    source_stat = os.stat(source_file_path)
+    dest_stat = os.stat(dest_file_path)
+    if source_stat.st_size != dest_stat.st_size or abs(source_stat.st_mtime - dest_stat.st_mtime) > mtime_tolerance: # copy2 keeps the source mtime, so a changed source shows up here
+        return False
+    if verify_hash: # the source is hashed once however many folders it goes to
+        return FILECACHE.get_memo_hash(hash_memo, source_file_path) == FILECACHE.get_memo_hash(hash_memo, dest_file_path)
+    return True
+
+def place_file(source_file_path, dest_file_path, placement_mode='copy'): # puts the source at the destination, falls back to a copy if the link can't be made, returns the mode used
+    clear_linked_dest(source_file_path, dest_file_path)
+    if placement_mode != 'copy':
         try:
-            shutil.copy2(source_file_path, dest_file_path) # copy file
-            print(f"Copied {source_file_name} to {dest_file_path}")
-
-            value['Gathered'] = True
-            value['Gathered file'] = source_file_name
-            value['Gathered timestamp'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S') # update dictionary values
-        except Exception as e:
-            print(f"Error copying {source_file_name}: {e}") # error handling
-            value['Gathered'] = False
+            link_file(source_file_path, dest_file_path, placement_mode)
+            return placement_mode
+        except (OSError, ValueError) as e:
+            print(f"Could not {placement_mode} {os.path.basename(source_file_path)}, copying instead: {e}")
+            if os.path.lexists(dest_file_path):
+                os.remove(dest_file_path)
+
+    shutil.copy2(source_file_path, dest_file_path) # copy file
+    return 'copy'
+
+def get_store_path(store_dir, file_hash, extension): # store files are named by their sha256, split into 256 folders so no one folder gets huge
+    return os.path.join(store_dir, file_hash[:2], file_hash + extension.lower())
+
+def add_to_store(source_file_path, store_path): # copies under a temporary name first, so two threads storing the same content can't leave a half written file
+    os.makedirs(os.path.dirname(store_path), exist_ok=True)
+    temp_path = f"{store_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    shutil.copy2(source_file_path, temp_path)
+    os.replace(temp_path, store_path)
+
+def load_manifest(directory): # manifest of an SCC folder built from the evidence store: file name -> hash, store file, source size/mtime and how it's shown in the folder
+    return FILECACHE.load_json(os.path.join(directory, manifest_filename), {}, 'manifest') # if it's unreadable everything in that folder just gets stored and linked again
+
+def save_manifest(directory, manifest):
+    os.makedirs(directory, exist_ok=True)
+    FILECACHE.save_json(os.path.join(directory, manifest_filename), manifest, sort_keys=True)
+
+def is_view_current(store_path, dest_file_path, manifest_entry, file_hash): # True if the folder already shows this store file the way the manifest says
+    if not manifest_entry or manifest_entry['hash'] != file_hash or not os.path.exists(store_path):
+        return False
+    if manifest_entry['view'] == 'manifest':
+        return not os.path.lexists(dest_file_path)
+    return is_dest_current(store_path, dest_file_path, manifest_entry['view'])
+
+def check_store_view(source_file_path, dest_file_path, store_dir, manifest_entry=None, verify_hash=False, hash_memo=None): # hash and store file for the source and whether the folder already shows it, only reads the disk
+    source_stat = os.stat(source_file_path)
+    source_unchanged = manifest_entry and manifest_entry['size'] == source_stat.st_size and abs(manifest_entry['mtime'] - source_stat.st_mtime) <= mtime_tolerance
+    file_hash = manifest_entry['hash'] if source_unchanged and not verify_hash else FILECACHE.get_memo_hash(hash_memo, source_file_path) # sources that haven't moved aren't hashed again
+    store_path = get_store_path(store_dir, file_hash, os.path.splitext(source_file_path)[1])
+    return file_hash, store_path, is_view_current(store_path, dest_file_path, manifest_entry, file_hash)
+
+def store_file(copy_job, plan): # puts the source in the evidence store once and links it into the SCC folder, the manifest is the view if linking fails
+    source_file_path = copy_job['source']
+    dest_file_path = copy_job['dest']
+    store_dir = plan['store dir']
+    view_mode = plan['placement mode'] if plan['placement mode'] in ('hardlink', 'symlink', 'reflink') else 'hardlink' # copying out of the store would undo the point of it
+
+    source_stat = os.stat(source_file_path)
+    file_hash = copy_job.get('hash') or FILECACHE.get_memo_hash(plan['hashes'], source_file_path) # hashed while planning
+    store_path = get_store_path(store_dir, file_hash, os.path.splitext(source_file_path)[1])
+    if not os.path.exists(store_path):
+        add_to_store(source_file_path, store_path)
+
+    store_entry = {'hash': file_hash, 'store file': os.path.relpath(store_path, store_dir), 'size': source_stat.st_size, 'mtime': source_stat.st_mtime, 'view': view_mode}
+    result = 'refreshed' if copy_job.get('manifest entry') or os.path.lexists(dest_file_path) else 'copied'
+    os.makedirs(os.path.dirname(dest_file_path), exist_ok=True)
+    try:
+        link_file(store_path, dest_file_path, view_mode)
+    except (OSError, ValueError) as e:
+        print(f"Could not {view_mode} {os.path.basename(dest_file_path)} from the evidence store, listing it in the manifest instead: {e}")
+        if os.path.lexists(dest_file_path):
+            os.remove(dest_file_path)
+        store_entry['view'] = 'manifest'
+    return {'result': result, 'placement': store_entry['view'], 'error': None, 'store entry': store_entry}
+
+def copy_file(copy_job, plan): # runs on the copy threads, errors are handed back instead of raised so one bad file doesn't stop the rest
+    try:
+        if plan['store dir']:
+            return store_file(copy_job, plan)
+        result = 'refreshed' if os.path.lexists(copy_job['dest']) else 'copied'
+        os.makedirs(os.path.dirname(copy_job['dest']), exist_ok=True)
+        return {'result': result, 'placement': place_file(copy_job['source'], copy_job['dest'], plan['placement mode']), 'error': None}
+    except Exception as e:
+        return {'result': 'failed', 'placement': None, 'error': e}
 
-    return doc_dict
+def run_copy_batch(copy_batch, plan, results, cancel_event=None): # every job for one destination folder, in plan order on one copy thread, each result is queued as soon as it's done
+    written = set()
+    store_entries = {}
+    queued = 0
+    try:
+        for copy_job in copy_batch:
+            dest_key = os.path.normcase(copy_job['dest'])
+            if cancel_event is not None and cancel_event.is_set(): # jobs not started yet are dropped, the ones already done stay done
+                result = {'result': 'cancelled', 'placement': None, 'error': None}
+            elif copy_job['action'] == 'skip' and dest_key not in written: # checked while planning, nothing to do
+                result = {'result': 'skipped', 'placement': None, 'error': None}
+            else:
+                result = copy_file(copy_job, plan)
+                written.add(dest_key) # a later job for the same file can't trust its plan any more
+            if result.get('store entry'):
+                store_entries[os.path.basename(copy_job['dest'])] = result['store entry']
+            results.put((copy_job, result))
+            queued += 1
+
+        if store_entries: # this thread owns the folder, so it owns the manifest too
+            directory = os.path.dirname(copy_batch[0]['dest'])
+            manifest = plan['manifests'].setdefault(directory, {})
+            manifest.update(store_entries)
+            try:
+                save_manifest(directory, manifest)
+            except OSError as e:
+                print(f"Error saving manifest in {directory}: {e}")
+    except Exception as e: # anything copy_file didn't catch, every job not handed back yet fails with it so execute_plan never waits on a result that isn't coming
+        print(f"Error copying to {os.path.dirname(copy_batch[0]['dest'])}: {e}")
+        for copy_job in copy_batch[queued:]:
+            results.put((copy_job, {'result': 'failed', 'placement': None, 'error': e}))
+
+def finish_copy_job(copy_job, result): # update the dictionary values once a copy is done, only ever called from the thread running the gather
+    source_file_name = os.path.basename(copy_job['source'])
+    copy_job['result'] = result['result']
+    copy_job['placement'] = result['placement']
+    copy_job['error'] = str(result['error']) if result['error'] else None
+    if result['result'] == 'cancelled': # left as it was before the gather
+        return
+    if result['error']:
+        print(f"Error copying {source_file_name}: {result['error']}") # error handling
+        for value in copy_job['values']:
+            value['Gathered'] = False
+        return
+
+    if result['result'] == 'skipped':
+        print(f"Unchanged {source_file_name} at {copy_job['dest']}")
+    else:
+        print(f"{placement_verbs[result['placement']]} {source_file_name} to {copy_job['dest']}")
+    for value in copy_job['values']:
+        value['Gathered'] = True
+        value['Gathered file'] = source_file_name
+        value['Gathered timestamp'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S') # update dictionary values
+
+def count_copy_jobs(copy_jobs): # copied/skipped/refreshed/failed/cancelled totals for the end of a gather
+    counts = {'copied': 0, 'skipped': 0, 'refreshed': 0, 'failed': 0, 'cancelled': 0}
+    for copy_job in copy_jobs:
+        counts[copy_job['result']] += 1
+    return counts
+
+def get_copy_batches(copy_jobs): # jobs grouped by destination folder, folders and jobs keep their plan order
+    copy_batches = {}
+    for copy_job in copy_jobs:
+        copy_batches.setdefault(os.path.normcase(os.path.dirname(copy_job['dest'])), []).append(copy_job)
+    return list(copy_batches.values())
+
+def execute_plan(plan, copy_workers=1, progress=None, cancel_event=None): # runs a gather plan, one folder per copy thread at a time, the dictionaries are updated as each copy finishes, progress(done, total, done_bytes, total_bytes) is called after each one
+    for resolved_item in plan['items']:
+        if resolved_item['message']:
+            print(resolved_item['message'])
+        if resolved_item['action'] == 'not found':
+            resolved_item['value']['Gathered'] = False
+
+    copy_jobs = plan['copy jobs']
+    total_bytes = sum(copy_job['bytes'] for copy_job in copy_jobs)
+    done_bytes = 0
+    results = queue.Queue()
+    with ThreadPoolExecutor(max_workers=max(1, copy_workers)) as executor: # copying is mostly waiting on the disk or network share, so threads are enough
+        for copy_batch in get_copy_batches(copy_jobs):
+            executor.submit(run_copy_batch, copy_batch, plan, results, cancel_event)
+        for done in range(1, len(copy_jobs) + 1):
+            copy_job, result = results.get()
+            finish_copy_job(copy_job, result)
+            done_bytes += copy_job['bytes']
+            if progress:
+                progress(done, len(copy_jobs), done_bytes, total_bytes)
+
+    counts = count_copy_jobs(copy_jobs)
+    print(f"Gathered files: {counts['copied']} copied, {counts['skipped']} skipped, {counts['refreshed']} refreshed, {counts['failed']} failed")
+    if counts['cancelled']:
+        print(f"Gather cancelled, {counts['cancelled']} files left for the next gather")
+    return counts
 
 def extract_attest_info(text):
     try:
@@ -141,31 +614,61 @@ def extract_attest_info(text):
         print(f"Error extracting information: {e}")
         return "Status: Error", "N/A", "N/A", "N/A", "N/A" # if there are problems, set everything to n/a
 
-def extract_BPER_info(pdf_path): #grabbing info from BPERs
-    try:
-        doc = fitz.open(pdf_path)
+def extract_attestation_pdf_info(pdf_path): # reads the attestation PDF and runs extract_attest_info on all of its text
+    with fitz.open(pdf_path) as doc:
         text = ""
         for page in doc:
-            text += page.get_text()
-
-        # Extract date
-        date_match = re.search(r"Valid To:\s*(\d{4}-\d{2}-\d{2}) \d{2}:\d{2}:\d{2}", text) 
-        valid_to_date = date_match.group(1) if date_match else "N/A"
+            text += page.get_text() # look through every page
+    return extract_attest_info(text)
 
-        # Extract text between "State:" and "CMS:"
-        status_match = re.search(r"State:\s*(\S+)", text)
-        approval_status = status_match.group(1).strip() if status_match else "Status: Not Found"
+def find_complete_match(pattern, text, last_page=False): # first match that can't change when the next page is added, one that runs to the end of the text might keep going
+    match = pattern.search(text)
+    if match and (last_page or match.end() < len(text)):
+        return match
+    return None
 
-        # Check for "Technical Limitation"
-        tla_match = re.search(r"Technical Limitation[^.]*", text)
-        tla_present = bool(tla_match)
-
-        return valid_to_date, approval_status, tla_present
+def extract_BPER_info(pdf_path, stats=None): #grabbing info from BPERs, page by page, stops as soon as every field is found, stats gets the pages read
+    doc = None
+    try:
+        doc = fitz.open(pdf_path)
+        valid_to_date = None
+        approval_status = None
+        tla_present = False
+        carry = "" # end of the text so far, so a field split across a page break is still found
+        pages_read = 0
+        for page in doc:
+            pages_read += 1
+            text = carry + page.get_text()
+            last_page = pages_read == doc.page_count
+
+            # Extract date
+            if valid_to_date is None:
+                date_match = find_complete_match(bper_date_pattern, text, last_page)
+                valid_to_date = date_match.group(1) if date_match else None
+
+            # Extract text between "State:" and "CMS:"
+            if approval_status is None:
+                status_match = find_complete_match(bper_status_pattern, text, last_page)
+                approval_status = status_match.group(1).strip() if status_match else None
+
+            # Check for "Technical Limitation"
+            if not tla_present:
+                tla_present = bool(bper_tla_pattern.search(text))
+
+            if valid_to_date is not None and approval_status is not None and tla_present: # nothing left to find, the rest of the pages don't matter
+                break
+            carry = text[-bper_page_overlap:]
+
+        if stats is not None:
+            stats['Pages read'] = pages_read
+            stats['Pages'] = doc.page_count
+        return valid_to_date or "N/A", approval_status or "Status: Not Found", tla_present
     except Exception as e:
         print(f"Error processing {pdf_path}: {e}"'\n') # error message
         return "N/A", "Status: Error", False
     finally:
-        doc.close() # close doc 
+        if doc is not None:
+            doc.close() # close doc 
 
 def extract_Doc_info(filepath): # grab info from Supporting Docs
     try:
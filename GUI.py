@@ -1,12 +1,17 @@
 import tkinter as tk
 from tkinter import filedialog
+from tkinter import ttk
 import os
 import json
+import time
+import queue
+import threading
 import JSONTOEXCEL
 import KAIZEN
 import FILEGRAB
 import UPDATEINFO
-import SCCREAD
+import SCCCACHE
+import FILECACHE
 import SCCTABLES
 import SPLITBPER
 import re
@@ -22,6 +27,9 @@ progress_file = None
 scc_dir = None
 project_dir = None
 template_dir = None
+scc_workers = os.cpu_count() or 1 # worker processes used to read SCCs when starting a new project
+background_task = None # the gather or pull running on the worker thread, only one at a time
+progress_poll_ms = 100 # how often the window checks on the worker
 
 def select_directory(prompt): # pop up for selecting dirs
     directory = filedialog.askdirectory(title=prompt)
@@ -131,6 +139,8 @@ def refresh_dashboard():
     # Add code here to update the pie chart based on the latest data
 
 def start_new_project():
+    if is_task_running():
+        return
     global project_dir
     project_dir = select_directory("Select the project directory") # select project directory
     if project_dir:
@@ -138,7 +148,7 @@ def start_new_project():
         if scc_repo:
             global progress_file
             progress_file = os.path.join(project_dir, "progress.json") # set progress file path
-            KAIZEN.build_progress_json(scc_repo, project_dir) # build initial progress.json
+            KAIZEN.build_progress_json(scc_repo, project_dir, scc_workers) # build initial progress.json
             
             with open(progress_file, 'r') as file:
                 progress_data = json.load(file)
@@ -160,6 +170,8 @@ def start_new_project():
         error_label.config(text="Please select a valid project directory.")
 
 def generate_md_files():
+    if is_task_running():
+        return
     if progress_file and project_dir:
         SCCTABLES.generate_scc_info_docs(progress_file) # generate markdown files
         
@@ -218,6 +230,8 @@ def update_directory_labels():
         scc_dir_label.config(text="SCC Directory: Not selected")
 
 def mark_as_false_positive(item_type):
+    if is_task_running():
+        return
     # Mark selected items as false positive based on item type
     if item_type == "BPERs":
         selected_items = [not_gathered_bpers_listbox.get(idx) for idx in not_gathered_bpers_listbox.curselection()]
@@ -267,6 +281,8 @@ def mark_as_false_positive(item_type):
     listbox.delete(listbox.curselection())
 
 def manually_link_files(item_type):
+    if is_task_running():
+        return
     # Manually link selected files to items based on item type
     if item_type == "BPERs":
         selected_items = [not_gathered_bpers_listbox.get(idx) for idx in not_gathered_bpers_listbox.curselection()]
@@ -310,6 +326,8 @@ def manually_link_files(item_type):
         json.dump(progress_data, file, indent=4)
 
 def update_existing_project():
+    if is_task_running():
+        return
     global progress_file, project_dir
     progress_file = filedialog.askopenfilename(title="Select the progress.json file", filetypes=[("JSON Files", "*.json")])
     if progress_file:
@@ -397,6 +415,8 @@ def update_status_labels(program_settings):
     pull_info_status.config(text=pull_info_date)
 
 def save_project_settings():
+    if is_task_running():
+        return
     if progress_file:
         with open(progress_file, 'r') as file:
             progress_data = json.load(file)
@@ -413,6 +433,8 @@ def save_project_settings():
             json.dump(progress_data, file, indent=4)
 
 def select_template_directory():
+    if is_task_running():
+        return
     global template_dir
     template_dir = select_directory("Please select the Template directory") # select template directory
     if template_dir:
@@ -420,6 +442,8 @@ def select_template_directory():
         save_project_settings() # save settings
 
 def select_scc_directory():
+    if is_task_running():
+        return
     global scc_dir
     scc_dir = select_directory("Please select the SCC directory") # select SCC directory
     if scc_dir:
@@ -427,6 +451,8 @@ def select_scc_directory():
         save_project_settings() # save settings
 
 def select_bpers_directory():
+    if is_task_running():
+        return
     global bpers_dir
     bpers_dir = select_directory("Please select the BPERs directory") # select BPERs directory
     if bpers_dir:
@@ -434,6 +460,8 @@ def select_bpers_directory():
         save_project_settings() # save settings
 
 def select_attestation_directory():
+    if is_task_running():
+        return
     global attestation_dir
     attestation_dir = select_directory("Please select the Attestation directory") # select attestation directory
     if attestation_dir:
@@ -441,6 +469,8 @@ def select_attestation_directory():
         save_project_settings() # save settings
 
 def select_supporting_docs_directory():
+    if is_task_running():
+        return
     global supporting_docs_dir
     supporting_docs_dir = select_directory("Please select the Supporting Documents directory") # select supporting docs directory
     if supporting_docs_dir:
@@ -448,6 +478,8 @@ def select_supporting_docs_directory():
         save_project_settings() # save settings
 
 def select_progress_file():
+    if is_task_running():
+        return
     global progress_file
     progress_file = filedialog.askopenfilename(title="Select the progress.json file", filetypes=[("JSON Files", "*.json")])
     if progress_file:
@@ -456,43 +488,140 @@ def select_progress_file():
         update_directory_labels() # update directory labels
 
 def select_project_directory():
+    if is_task_running():
+        return
     global project_dir
     project_dir = select_directory("Select the project directory") # select project directory
     if project_dir:
         project_dir_label.config(text=f"Project Directory: {project_dir}") # update label
         save_project_settings() # save settings
 
+def is_task_running(): # the worker reads the directory settings while it runs and saves its own copy of progress.json at the end, so nothing else may change either until it's done
+    if background_task and background_task['thread'].is_alive():
+        error_label.config(text=f"Wait for the {background_task['name'].lower()} to finish, or cancel it.")
+        return True
+    return False
+
+def start_background_task(name, work, on_done): # runs work(task) on a worker thread so the window keeps responding, on_done(result) runs back on the main thread
+    global background_task
+    if is_task_running():
+        return
+
+    task = {'name': name, 'queue': queue.Queue(), 'cancel': threading.Event(), 'on done': on_done, 'started': None}
+    def run():
+        try:
+            task['queue'].put(('done', work(task)))
+        except Exception as e:
+            task['queue'].put(('error', str(e)))
+    task['thread'] = threading.Thread(target=run, daemon=True)
+    background_task = task
+
+    error_label.config(text="")
+    progress_bar['value'] = 0
+    progress_label.config(text=f"{name}: starting")
+    cancel_button.config(state="normal")
+    task['thread'].start()
+    root.after(progress_poll_ms, poll_background_task)
+
+def report_status(task, text): # worker thread side, widgets are only updated by poll_background_task
+    task['queue'].put(('status', text))
+
+def report_progress(task, done, total, done_bytes=0, total_bytes=0): # worker thread side, see report_status
+    task['queue'].put(('progress', done, total, done_bytes, total_bytes))
+
+def format_duration(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
+def show_task_progress(task, done, total, done_bytes, total_bytes): # counts, throughput and time left
+    if task['started'] is None:
+        task['started'] = time.time()
+    elapsed = max(time.time() - task['started'], 0.001)
+    progress_bar['maximum'] = max(total, 1)
+    progress_bar['value'] = done
+
+    text = f"{task['name']}: {done} of {total}, {done / elapsed:.1f} items/s"
+    if total_bytes:
+        text += f", {FILEGRAB.format_size(done_bytes / elapsed)}/s"
+    if 0 < done < total:
+        remaining = (total_bytes - done_bytes) / (done_bytes / elapsed) if total_bytes and done_bytes else (total - done) / (done / elapsed)
+        text += f", about {format_duration(remaining)} left"
+    if task['cancel'].is_set():
+        text += " (cancelling)"
+    progress_label.config(text=text)
+
+def poll_background_task(): # main thread, drains the worker's queue every progress_poll_ms
+    task = background_task
+    while True:
+        try:
+            message = task['queue'].get_nowait()
+        except queue.Empty:
+            break
+
+        if message[0] == 'status':
+            progress_label.config(text=f"{task['name']}: {message[1]}")
+        elif message[0] == 'progress':
+            show_task_progress(task, *message[1:])
+        else:
+            cancel_button.config(state="disabled")
+            if message[0] == 'error':
+                progress_label.config(text=f"{task['name']} failed")
+                error_label.config(text=f"{task['name']} failed: {message[1]}")
+            else:
+                progress_label.config(text=f"{task['name']} {'cancelled, finished work was saved' if task['cancel'].is_set() else 'done'}")
+                task['on done'](message[1])
+            return
+    root.after(progress_poll_ms, poll_background_task)
+
+def cancel_background_task(): # the worker finishes the files it's on, then saves and stops
+    if background_task and background_task['thread'].is_alive():
+        background_task['cancel'].set()
+        progress_label.config(text=f"{background_task['name']}: cancelling")
+
 def pull_information():
     if progress_file:
-        base_directories = {
-            'bper': bpers_dir,
-            'attestation': attestation_dir,
-            'doc': supporting_docs_dir
-        }
-        SPLITBPER.process_directory(bpers_dir) # make sure BPERs are split, or split them
-        UPDATEINFO.update_progress_info(progress_file, base_directories, scc_dir)
-        
-        with open(progress_file, 'r') as file:
-            progress_data = json.load(file)
-        
-        program_settings = progress_data.get('Program Settings', {})
+        start_background_task("Pull", run_pull, finish_pull)
+    else:
+        error_label.config(text="Please select a valid progress.json file.")
+
+def run_pull(task): # runs on the worker thread, nothing in here touches the widgets
+    base_directories = {
+        'bper': bpers_dir,
+        'attestation': attestation_dir,
+        'doc': supporting_docs_dir
+    }
+    report_status(task, "Splitting BPERs")
+    SPLITBPER.process_directory(bpers_dir, task['cancel']) # make sure BPERs are split, or split them
+    report_status(task, "Pulling information")
+    completed = UPDATEINFO.update_progress_info(progress_file, base_directories, scc_dir, progress=lambda done, total: report_progress(task, done, total), cancel_event=task['cancel'])
+    
+    with open(progress_file, 'r') as file:
+        progress_data = json.load(file)
+    
+    program_settings = progress_data.get('Program Settings', {})
+    if completed:
         program_settings['Pull Info Date'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         progress_data['Program Settings'] = program_settings
         
         with open(progress_file, 'w') as file:
             json.dump(progress_data, file, indent=4)
-        
-        update_status_labels(program_settings) # update status labels
-    else:
-        error_label.config(text="Please select a valid progress.json file.")
+    return program_settings
+
+def finish_pull(program_settings): # back on the main thread
+    update_status_labels(program_settings) # update status labels
 
 def sync_button_click():
+    if is_task_running():
+        return
     if progress_file:
         SCCTABLES.sync_progress_info(progress_file) # sync progress info
     else:
         error_label.config(text="Please select a valid progress.json file.")
 
 def build_dirs():
+    if is_task_running():
+        return
     if progress_file and project_dir:
         KAIZEN.create_directories(project_dir) # create directories
 
@@ -511,6 +640,8 @@ def build_dirs():
         error_label.config(text="Please select a valid progress.json file and project directory.")
 
 def build_templates():
+    if is_task_running():
+        return
     if progress_file and project_dir and template_dir:
         with open(progress_file, 'r') as file:
             progress_data = json.load(file)
@@ -528,38 +659,81 @@ def build_templates():
     else:
         error_label.config(text="Please select a valid progress.json file, project directory, and template directory.")
 
+def get_gather_settings(program_settings): # how gathered files get placed, shared by the gather and its preview
+    return {
+        'placement_mode': program_settings.get('Placement Mode', 'copy'), # copy, hardlink, symlink or reflink, anything that can't be linked is copied
+        'evidence_store': program_settings.get('Evidence Store', False), # keep one copy of each file under the project and link it into the SCC folders
+        'verify_hash': program_settings.get('Verify Gathered Files', False) # compare contents instead of size/mtime before skipping a file that's already there
+    }
+
+def preview_gather(): # dry run of the gather, shows what would be copied without touching the disk
+    if is_task_running():
+        return
+    if progress_file and bpers_dir and attestation_dir and supporting_docs_dir:
+        start_background_task("Preview", run_preview, finish_preview) # planning can hash every source and destination
+    else:
+        error_label.config(text="Please select a valid progress.json file and all required directories.")
+
+def run_preview(task): # runs on the worker thread, nothing in here touches the widgets
+    with open(progress_file, 'r') as file:
+        progress_data = json.load(file)
+    base_directories = {'bper': bpers_dir, 'doc': supporting_docs_dir, 'attestation': attestation_dir}
+    program_settings = progress_data.get('Program Settings', {})
+
+    report_status(task, "Planning gather")
+    directory_indexes = FILEGRAB.build_directory_indexes(base_directories, program_settings.get('Recursive Source Scan', False))
+    plan = FILEGRAB.plan_gather(progress_data.get('BPERs', {}), progress_data.get('Documents', {}), progress_data.get('Attestations', {}), base_directories, project_dir, directory_indexes, match_cache=progress_data.get('Document Matches', {}), cancel_event=task['cancel'], **get_gather_settings(program_settings))
+    if task['cancel'].is_set(): # a plan that stopped short would undercount
+        return None
+    return FILEGRAB.print_plan_summary(plan)
+
+def finish_preview(summary): # back on the main thread
+    if summary:
+        gather_docs_status.config(text=f"{summary['copy']} new, {summary['refresh']} changed, {summary['skip']} up to date, {FILEGRAB.format_size(summary['bytes'])}")
+
 def gather_docs():
     if progress_file and bpers_dir and attestation_dir and supporting_docs_dir:
-        SPLITBPER.process_directory(bpers_dir) # process BPERs directory
+        start_background_task("Gather", run_gather, finish_gather)
+    else:
+        error_label.config(text="Please select a valid progress.json file and all required directories.")
 
-        with open(progress_file, 'r') as file:
-            progress_data = json.load(file)
-            bper_dict = progress_data.get('BPERs', {})
-            doc_dict = progress_data.get('Documents', {})
-            attestation_dict = progress_data.get('Attestations', {})
-            base_directories = {'bper': bpers_dir, 'doc': supporting_docs_dir, 'attestation': attestation_dir}
-            
-            updated_bper_dict, updated_doc_dict, updated_attestation_dict = FILEGRAB.update_dictionaries_and_copy_files(bper_dict, doc_dict, attestation_dict, base_directories, project_dir)
-            
-            progress_data['BPERs'] = updated_bper_dict
-            progress_data['Documents'] = updated_doc_dict
-            progress_data['Attestations'] = updated_attestation_dict
+def run_gather(task): # runs on the worker thread, nothing in here touches the widgets
+    report_status(task, "Splitting BPERs")
+    SPLITBPER.process_directory(bpers_dir, task['cancel']) # process BPERs directory
 
-            program_settings = progress_data.get('Program Settings', {})
+    with open(progress_file, 'r') as file:
+        progress_data = json.load(file)
+        bper_dict = progress_data.get('BPERs', {})
+        doc_dict = progress_data.get('Documents', {})
+        attestation_dict = progress_data.get('Attestations', {})
+        base_directories = {'bper': bpers_dir, 'doc': supporting_docs_dir, 'attestation': attestation_dir}
+        
+        report_status(task, "Planning gather")
+        match_cache = progress_data.setdefault('Document Matches', {}) # document matches from earlier runs are reused if the folder hasn't changed
+        program_settings = progress_data.get('Program Settings', {})
+        copy_workers = program_settings.get('Copy Workers', FILEGRAB.default_copy_workers) # files copied at once, can be lowered for slow shares
+        directory_indexes = FILEGRAB.build_directory_indexes(base_directories, program_settings.get('Recursive Source Scan', False)) # 'Recursive Source Scan' reads nested source trees instead of flat folders
+        updated_bper_dict, updated_doc_dict, updated_attestation_dict = FILEGRAB.update_dictionaries_and_copy_files(bper_dict, doc_dict, attestation_dict, base_directories, project_dir, directory_indexes=directory_indexes, match_cache=match_cache, copy_workers=copy_workers, progress=lambda *counts: report_progress(task, *counts), cancel_event=task['cancel'], **get_gather_settings(program_settings))
+        
+        progress_data['BPERs'] = updated_bper_dict
+        progress_data['Documents'] = updated_doc_dict
+        progress_data['Attestations'] = updated_attestation_dict
+
+        if not task['cancel'].is_set(): # a cancelled gather saves the files it got to, but isn't counted as a gather
             pull_info_date = program_settings.get('Pull Info Date')
 
             if pull_info_date:
                 remove_lower_versions(supporting_docs_dir) # remove older versions
 
             program_settings['Gather and Sort Date'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            progress_data['Program Settings'] = program_settings
-            
-            with open(progress_file, 'w') as file:
-                json.dump(progress_data, file, indent=4)
-            
-            gather_docs_status.config(text=program_settings['Gather and Sort Date']) # update status label
-    else:
-        error_label.config(text="Please select a valid progress.json file and all required directories.")
+        progress_data['Program Settings'] = program_settings
+        
+        with open(progress_file, 'w') as file:
+            json.dump(progress_data, file, indent=4)
+    return program_settings
+
+def finish_gather(program_settings): # back on the main thread
+    gather_docs_status.config(text=program_settings.get('Gather and Sort Date') or "Not done") # update status label
 
 def remove_lower_versions(directory):
     # Remove lower versions of files in the specified directory
@@ -588,6 +762,8 @@ def remove_lower_versions(directory):
                     print(f"Removed lower version: {file}")
 
 def remove_scc():
+    if is_task_running():
+        return
     remove_scc_window = tk.Toplevel(root) # create new window for SCC removal
     remove_scc_window.title("Remove an SCC")
     remove_scc_window.geometry("400x300")
@@ -615,6 +791,8 @@ def remove_scc():
     delete_button.pack(pady=10)
 
 def delete_scc(scc_name):
+    if is_task_running():
+        return
     if progress_file:
         with open(progress_file, 'r') as file:
             progress_data = json.load(file)
@@ -657,6 +835,8 @@ def clear_frames():
         frame.pack_forget() # hide all specified frames
 
 def add_or_redo_scc():
+    if is_task_running():
+        return
     # Open file explorer dialog to select an Excel file
     file_path = filedialog.askopenfilename(filetypes=[("Excel Files", "*.xlsx;*.xls")])
     
@@ -669,27 +849,15 @@ def add_or_redo_scc():
         with open(progress_file, 'r') as file:
             progress_data = json.load(file)
         
-        # Check if the SCC exists in progress data
-        if scc_name in progress_data['SCC']:
-            # Remove all entries with the matching SCC name
-            for key in ['BPERs', 'Attestations', 'Documents', 'SCC', 'Checks']:
-                progress_data[key] = {k: v for k, v in progress_data[key].items() if v.get('SCC') != scc_name}
-        
-        # Process the selected Excel file
-        bper_dict, doc_dict, attestation_dict, method_dict = SCCREAD.process_excel_file(file_path)
+        # Process the selected Excel file, straight from the cache if it hasn't changed
+        scc_cache = SCCCACHE.load_cache(os.path.dirname(progress_file))
+        scc_result = SCCCACHE.load_scc_file(file_path, scc_cache)
+        FILECACHE.save_cache(scc_cache)
         
-        # Update progress data with the new information
-        for key, value in bper_dict.items():
-            progress_data['BPERs'][key] = value
-        for key, value in doc_dict.items():
-            progress_data['Documents'][key] = value
-        for key, value in attestation_dict.items():
-            progress_data['Attestations'][key] = value
-        for stig_id, details in method_dict.items():
-            progress_data['Checks'][stig_id] = {
-                'SCC': scc_name,
-                'Evidence method': details['Evidence Method']
-            }
+        # Only add new items and retire removed ones, unchanged items keep their gathered state, links and dates
+        if KAIZEN.reingest_scc(progress_data, file_path, scc_result) is None:
+            error_label.config(text=f"Could not read SCC '{scc_name}', progress.json was not changed.")
+            return
         
         # Save the updated progress data to progress.json
         with open(progress_file, 'w') as file:
@@ -740,265 +908,289 @@ def output_progress():
     else:
         error_label.config(text="Please select a valid progress.json file and project directory.")
 
-# GUI setup
-root = tk.Tk()
-root.title("TDL on Easy Mode")
-root.geometry("800x600")
-
-# Welcome screen setup
-welcome_screen = tk.Frame(root)
-welcome_label = tk.Label(welcome_screen, text="Welcome to TDL on Easy Mode!")
-welcome_label.pack(pady=20)
-
-new_project_button = tk.Button(welcome_screen, text="Start New Project", command=start_new_project)
-new_project_button.pack(pady=10)
-
-existing_project_button = tk.Button(welcome_screen, text="Update Existing Project", command=update_existing_project)
-existing_project_button.pack(pady=10)
-
-# Options screen setup
-options_screen = tk.Frame(root, bg="#F0F0F0")
-options_screen.pack(fill="both", expand=True)
-options_label = tk.Label(options_screen, text="What would you like to do?", font=("Arial", 16, "bold"), bg="#F0F0F0")
-options_label.pack(pady=20)
-
-button_frame = tk.Frame(options_screen, bg="#F0F0F0")
-button_frame.pack(pady=20)
-
-# Pull Information setup
-pull_info_frame = tk.LabelFrame(button_frame, text="Pull Information", font=("Arial", 12), bg="#FFFFFF", padx=10, pady=10)
-pull_info_frame.pack(side="left", padx=20)
-pull_info_button = tk.Button(pull_info_frame, text="Pull", font=("Arial", 10), width=15, command=pull_information)
-pull_info_button.pack(pady=5)
-pull_info_status = tk.Label(pull_info_frame, text="Not done", font=("Arial", 10), bg="#FFFFFF")
-pull_info_status.pack()
-
-# Build TDL Directories setup
-build_dirs_frame = tk.LabelFrame(button_frame, text="Build TDL Directories", font=("Arial", 12), bg="#FFFFFF", padx=10, pady=10)
-build_dirs_frame.pack(side="left", padx=20)
-build_dirs_button = tk.Button(build_dirs_frame, text="Build", font=("Arial", 10), width=15, command=build_dirs)
-build_dirs_button.pack(pady=5)
-build_dirs_status = tk.Label(build_dirs_frame, text="Not done", font=("Arial", 10), bg="#FFFFFF")
-build_dirs_status.pack()
-
-# Build Templates setup
-build_templates_frame = tk.LabelFrame(button_frame, text="Build Templates", font=("Arial", 12), bg="#FFFFFF", padx=10, pady=10)
-build_templates_frame.pack(side="left", padx=20)
-build_templates_button = tk.Button(build_templates_frame, text="Build", font=("Arial", 10), width=15, command=build_templates)
-build_templates_button.pack(pady=5)
-build_templates_status = tk.Label(build_templates_frame, text="Not done", font=("Arial", 10), bg="#FFFFFF")
-build_templates_status.pack()
-
-# Gather and Sort Documents setup
-gather_docs_frame = tk.LabelFrame(button_frame, text="Gather and Sort Documents", font=("Arial", 12), bg="#FFFFFF", padx=10, pady=10)
-gather_docs_frame.pack(side="left", padx=20)
-gather_docs_button = tk.Button(gather_docs_frame, text="Gather", font=("Arial", 10), width=15, command=gather_docs)
-gather_docs_button.pack(pady=5)
-gather_docs_status = tk.Label(gather_docs_frame, text="Not done", font=("Arial", 10), bg="#FFFFFF")
-gather_docs_status.pack()
-
-# Generate MD Files setup
-generate_md_frame = tk.LabelFrame(button_frame, text="Generate MD Files", font=("Arial", 12), bg="#FFFFFF", padx=10, pady=10)
-generate_md_frame.pack(side="left", padx=20)
-generate_md_button = tk.Button(generate_md_frame, text="Generate", font=("Arial", 10), width=15, command=generate_md_files)
-generate_md_button.pack(pady=5)
-generate_md_status = tk.Label(generate_md_frame, text="Not done", font=("Arial", 10), bg="#FFFFFF")
-generate_md_status.pack()
-
-# Update Document Tracker setup
-update_tracker_frame = tk.LabelFrame(button_frame, text="Update Document Tracker", font=("Arial", 12), bg="#FFFFFF", padx=10, pady=10)
-update_tracker_frame.pack(side="left", padx=20)
-update_tracker_button = tk.Button(update_tracker_frame, text="Update", font=("Arial", 10), width=15, command=update_tracker)
-update_tracker_button.pack(pady=5)
-update_tracker_status = tk.Label(update_tracker_frame, text="Not done", font=("Arial", 10), bg="#FFFFFF")
-update_tracker_status.pack()
-
-# Additional buttons setup
-additional_buttons_frame = tk.Frame(options_screen, bg="#F0F0F0")
-additional_buttons_frame.pack(pady=20)
-
-output_progress_button = tk.Button(additional_buttons_frame, text="Output progress", font=("Arial", 12), width=15, command=output_progress)
-output_progress_button.pack(side="left", padx=10)
-
-add_redo_scc_button = tk.Button(additional_buttons_frame, text="Add or redo an SCC", font=("Arial", 12), width=20, command=add_or_redo_scc)
-add_redo_scc_button.pack(side="left", padx=10)
-
-remove_scc_button = tk.Button(additional_buttons_frame, text="Remove an SCC", font=("Arial", 12), width=20, command=remove_scc)
-remove_scc_button.pack(side="left", padx=10)
-
-sync_button = tk.Button(additional_buttons_frame, text="Sync", font=("Arial", 12), width=15, command=sync_button_click)
-sync_button.pack(side="left", padx=10)
-
-dashboard_button = tk.Button(additional_buttons_frame, text="Dashboard", font=("Arial", 12), width=15, command=show_dashboard)
-dashboard_button.pack(side="right", padx=10)
-
-# Selected Directories setup
-directory_labels_frame = tk.LabelFrame(options_screen, text="Selected Directories", font=("Arial", 12), bg="#FFFFFF", padx=10, pady=10)
-directory_labels_frame.pack(pady=40)
-
-directory_canvas = tk.Canvas(directory_labels_frame, bg="#FFFFFF", width=800)
-directory_canvas.pack(side="left", fill="both", expand=True)
-
-directory_scrollbar = tk.Scrollbar(directory_labels_frame, orient="vertical", command=directory_canvas.yview)
-directory_scrollbar.pack(side="right", fill="y")
-
-directory_canvas.configure(yscrollcommand=directory_scrollbar.set)
-directory_canvas.bind("<Configure>", lambda e: directory_canvas.configure(scrollregion=directory_canvas.bbox("all")))
-
-directory_frame = tk.Frame(directory_canvas, bg="#FFFFFF", width=800)
-directory_canvas.create_window((0, 0), window=directory_frame, anchor="nw")
-
-# BPERs Directory setup
-bpers_frame = tk.Frame(directory_frame, bg="#FFFFFF")
-bpers_frame.pack(anchor="w", pady=5)
-bpers_dir_button = tk.Button(bpers_frame, text="Select", font=("Arial", 10), command=select_bpers_directory)
-bpers_dir_button.pack(side="left", padx=10)
-bpers_dir_label = tk.Label(bpers_frame, text="BPERs Directory: Not selected", font=("Arial", 10), bg="#FFFFFF")
-bpers_dir_label.pack(side="left")
-
-# Attestation Directory setup
-attestation_frame = tk.Frame(directory_frame, bg="#FFFFFF")
-attestation_frame.pack(anchor="w", pady=5)
-attestation_dir_button = tk.Button(attestation_frame, text="Select", font=("Arial", 10), command=select_attestation_directory)
-attestation_dir_button.pack(side="left", padx=10)
-attestation_dir_label = tk.Label(attestation_frame, text="Attestation Directory: Not selected", font=("Arial", 10), bg="#FFFFFF")
-attestation_dir_label.pack(side="left")
-
-# Supporting Documents Directory setup
-supporting_docs_frame = tk.Frame(directory_frame, bg="#FFFFFF")
-supporting_docs_frame.pack(anchor="w", pady=5)
-supporting_docs_dir_button = tk.Button(supporting_docs_frame, text="Select", font=("Arial", 10), command=select_supporting_docs_directory)
-supporting_docs_dir_button.pack(side="left", padx=10)
-supporting_docs_dir_label = tk.Label(supporting_docs_frame, text="Supporting Documents Directory: Not selected", font=("Arial", 10), bg="#FFFFFF")
-supporting_docs_dir_label.pack(side="left")
-
-# SCC Directory setup
-scc_frame = tk.Frame(directory_frame, bg="#FFFFFF")
-scc_frame.pack(anchor="w", pady=5)
-scc_dir_button = tk.Button(scc_frame, text="Select", font=("Arial", 10), command=select_scc_directory)
-scc_dir_button.pack(side="left", padx=10)
-scc_dir_label = tk.Label(scc_frame, text="SCC Directory: Not selected", font=("Arial", 10), bg="#FFFFFF")
-scc_dir_label.pack(side="left")
-
-# Progress File setup
-progress_file_frame = tk.Frame(directory_frame, bg="#FFFFFF")
-progress_file_frame.pack(anchor="w", pady=5)
-progress_file_button = tk.Button(progress_file_frame, text="Select", font=("Arial", 10), command=select_progress_file)
-progress_file_button.pack(side="left", padx=10)
-progress_file_label = tk.Label(progress_file_frame, text="Progress File: Not selected", font=("Arial", 10), bg="#FFFFFF")
-progress_file_label.pack(side="left")
-
-# Project Directory setup
-project_dir_frame = tk.Frame(directory_frame, bg="#FFFFFF")
-project_dir_frame.pack(anchor="w", pady=5)
-project_dir_button = tk.Button(project_dir_frame, text="Select", font=("Arial", 10), command=select_project_directory)
-project_dir_button.pack(side="left", padx=10)
-project_dir_label = tk.Label(project_dir_frame, text="Project Directory: Not selected", font=("Arial", 10), bg="#FFFFFF")
-project_dir_label.pack(side="left")
-
-# Template Directory setup
-template_dir_frame = tk.Frame(directory_frame, bg="#FFFFFF")
-template_dir_frame.pack(anchor="w", pady=5)
-template_dir_button = tk.Button(template_dir_frame, text="Select", font=("Arial", 10), command=select_template_directory)
-template_dir_button.pack(side="left", padx=10)
-template_dir_label = tk.Label(template_dir_frame, text="Template Directory: Not selected", font=("Arial", 10), bg="#FFFFFF")
-template_dir_label.pack(side="left")
-
-# Gather Docs screen setup
-gather_docs_screen = tk.Frame(root)
-gather_docs_label = tk.Label(gather_docs_screen, text="Select Document Repositories")
-gather_docs_label.pack(pady=20)
-gather_docs_buttons_frame = tk.Frame(gather_docs_screen)
-gather_docs_buttons_frame.pack(pady=20)
-
-sort_button = tk.Button(gather_docs_screen, text="Sort!", command=sort_docs)
-sort_button.pack(pady=20)
-
-# Error label setup
-error_label = tk.Label(root, text="", fg="red")
-error_label.pack(pady=10)
-
-# Dashboard screen setup
-dashboard_screen = tk.Frame(root, bg="#F0F0F0")
-
-back_button = tk.Button(dashboard_screen, text="Back", font=("Arial", 12), width=15, command=show_options)
-back_button.pack(side="bottom", padx=10, pady=10)
-
-# Section 1 (SCC List) setup
-section1_frame = tk.Frame(dashboard_screen, bg="#FFFFFF", padx=10, pady=10)
-section1_frame.pack(side="left", fill="both", expand=True)
-
-section2_frame = tk.Frame(dashboard_screen, bg="#FFFFFF", padx=10, pady=10)
-section2_frame.pack(side="left", fill="both", expand=True)
-
-section2_label = tk.Label(section2_frame, text="Items Not Gathered", font=("Arial", 12, "bold"), bg="#FFFFFF")
-section2_label.pack(pady=10)
-
-# Items Not Gathered (Attestations) setup
-not_gathered_attestations_label = tk.Label(section2_frame, text="Attestations", font=("Arial", 10, "bold"), bg="#FFFFFF")
-not_gathered_attestations_label.pack(pady=5)
-not_gathered_attestations_listbox = tk.Listbox(section2_frame, font=("Arial", 10), bg="#FFFFFF", selectmode="multiple")
-not_gathered_attestations_listbox.pack(fill="both", expand=True)
-
-attestations_buttons_frame = tk.Frame(section2_frame)
-attestations_buttons_frame.pack(pady=5)
-mark_attestation_false_positive_button = tk.Button(attestations_buttons_frame, text="Mark as False Positive", font=("Arial", 10), command=lambda: mark_as_false_positive("Attestations"))
-mark_attestation_false_positive_button.pack(side="left", padx=5)
-manually_link_attestations_button = tk.Button(attestations_buttons_frame, text="Assign Match", font=("Arial", 10), command=lambda: manually_link_files("Attestations"))
-manually_link_attestations_button.pack(side="left", padx=5)
-
-not_gathered_bpers_label = tk.Label(section2_frame, text="BPERs", font=("Arial", 10, "bold"), bg="#FFFFFF")
-not_gathered_bpers_label.pack(pady=5)
-not_gathered_bpers_listbox = tk.Listbox(section2_frame, font=("Arial", 10), bg="#FFFFFF", selectmode="multiple")
-not_gathered_bpers_listbox.pack(fill="both", expand=True)
-
-bpers_buttons_frame = tk.Frame(section2_frame)
-bpers_buttons_frame.pack(pady=5)
-mark_bper_false_positive_button = tk.Button(bpers_buttons_frame, text="Mark as False Positive", font=("Arial", 10), command=lambda: mark_as_false_positive("BPERs"))
-mark_bper_false_positive_button.pack(side="left", padx=5)
-manually_link_bpers_button = tk.Button(bpers_buttons_frame, text="Assign Match", font=("Arial", 10), command=lambda: manually_link_files("BPERs"))
-manually_link_bpers_button.pack(side="left", padx=5)
-
-# Items Not Gathered (Documents) setup 
-not_gathered_documents_label = tk.Label(section2_frame, text="Documents", font=("Arial", 10, "bold"), bg="#FFFFFF")
-not_gathered_documents_label.pack(pady=5)
-not_gathered_documents_listbox = tk.Listbox(section2_frame, font=("Arial", 10), bg="#FFFFFF", selectmode="multiple")
-not_gathered_documents_listbox.pack(fill="both", expand=True)
-
-documents_buttons_frame = tk.Frame(section2_frame)
-documents_buttons_frame.pack(pady=5)
-mark_document_false_positive_button = tk.Button(documents_buttons_frame, text="Mark as False Positive", font=("Arial", 10), command=lambda: mark_as_false_positive("Documents"))
-mark_document_false_positive_button.pack(side="left", padx=5)
-manually_link_documents_button = tk.Button(documents_buttons_frame, text="Assign Match", font=("Arial", 10), command=lambda: manually_link_files("Documents"))
-manually_link_documents_button.pack(side="left", padx=5)
-
-# Section 3 (Dates and Chart) setup 
-section3_frame = tk.Frame(dashboard_screen, bg="#FFFFFF", padx=10, pady=10)
-section3_frame.pack(side="left", fill="both", expand=True)
-
-section1_label = tk.Label(section1_frame, text="SCC List", font=("Arial", 12), bg="#FFFFFF")
-section1_label.pack(pady=10)
-
-scc_listbox = tk.Listbox(section1_frame, font=("Arial", 10), bg="#FFFFFF")
-scc_listbox.pack(fill="both", expand=True)
-scc_listbox.bind("<Double-Button-1>", open_scc_markdown_file)
-
-section3_label = tk.Label(section3_frame, text="Dates and Chart", font=("Arial", 12), bg="#FFFFFF")
-section3_label.pack(pady=10)
-
-last_info_pull_label = tk.Label(section3_frame, text="Last Info Pull: N/A", font=("Arial", 10), bg="#FFFFFF")
-last_info_pull_label.pack(pady=5)
-
-last_doc_pull_label = tk.Label(section3_frame, text="Last Doc Pull: N/A", font=("Arial", 10), bg="#FFFFFF")
-last_doc_pull_label.pack(pady=5)
-
-last_checklist_generated_label = tk.Label(section3_frame, text="Last Checklist Generated: N/A", font=("Arial", 10), bg="#FFFFFF")
-last_checklist_generated_label.pack(pady=5)
-
-# Placeholder for the pie chart
-pie_chart_label = tk.Label(section3_frame, text="", font=("Arial", 10), bg="#FFFFFF", justify="center")
-pie_chart_label.pack(pady=10)
-
-# Show the welcome screen initially
-show_welcome()
-root.mainloop()
+# GUI setup, only built when GUI.py is run, worker processes started with spawn import this module again and mustn't open a window
+def main():
+    global root, welcome_screen, options_screen, pull_info_status, build_dirs_status, build_templates_status, gather_docs_status, generate_md_status, \
+        progress_bar, cancel_button, progress_label, bpers_dir_label, attestation_dir_label, supporting_docs_dir_label, scc_dir_label, \
+        progress_file_label, project_dir_label, template_dir_label, gather_docs_screen, error_label, dashboard_screen, \
+        not_gathered_attestations_listbox, not_gathered_bpers_listbox, not_gathered_documents_listbox, scc_listbox, last_info_pull_label, \
+        last_doc_pull_label, last_checklist_generated_label, pie_chart_label
+    root = tk.Tk()
+    root.title("TDL on Easy Mode")
+    root.geometry("800x600")
+
+    # Welcome screen setup
+    welcome_screen = tk.Frame(root)
+    welcome_label = tk.Label(welcome_screen, text="Welcome to TDL on Easy Mode!")
+    welcome_label.pack(pady=20)
+
+    new_project_button = tk.Button(welcome_screen, text="Start New Project", command=start_new_project)
+    new_project_button.pack(pady=10)
+
+    existing_project_button = tk.Button(welcome_screen, text="Update Existing Project", command=update_existing_project)
+    existing_project_button.pack(pady=10)
+
+    # Options screen setup
+    options_screen = tk.Frame(root, bg="#F0F0F0")
+    options_screen.pack(fill="both", expand=True)
+    options_label = tk.Label(options_screen, text="What would you like to do?", font=("Arial", 16, "bold"), bg="#F0F0F0")
+    options_label.pack(pady=20)
+
+    button_frame = tk.Frame(options_screen, bg="#F0F0F0")
+    button_frame.pack(pady=20)
+
+    # Pull Information setup
+    pull_info_frame = tk.LabelFrame(button_frame, text="Pull Information", font=("Arial", 12), bg="#FFFFFF", padx=10, pady=10)
+    pull_info_frame.pack(side="left", padx=20)
+    pull_info_button = tk.Button(pull_info_frame, text="Pull", font=("Arial", 10), width=15, command=pull_information)
+    pull_info_button.pack(pady=5)
+    pull_info_status = tk.Label(pull_info_frame, text="Not done", font=("Arial", 10), bg="#FFFFFF")
+    pull_info_status.pack()
+
+    # Build TDL Directories setup
+    build_dirs_frame = tk.LabelFrame(button_frame, text="Build TDL Directories", font=("Arial", 12), bg="#FFFFFF", padx=10, pady=10)
+    build_dirs_frame.pack(side="left", padx=20)
+    build_dirs_button = tk.Button(build_dirs_frame, text="Build", font=("Arial", 10), width=15, command=build_dirs)
+    build_dirs_button.pack(pady=5)
+    build_dirs_status = tk.Label(build_dirs_frame, text="Not done", font=("Arial", 10), bg="#FFFFFF")
+    build_dirs_status.pack()
+
+    # Build Templates setup
+    build_templates_frame = tk.LabelFrame(button_frame, text="Build Templates", font=("Arial", 12), bg="#FFFFFF", padx=10, pady=10)
+    build_templates_frame.pack(side="left", padx=20)
+    build_templates_button = tk.Button(build_templates_frame, text="Build", font=("Arial", 10), width=15, command=build_templates)
+    build_templates_button.pack(pady=5)
+    build_templates_status = tk.Label(build_templates_frame, text="Not done", font=("Arial", 10), bg="#FFFFFF")
+    build_templates_status.pack()
+
+    # Gather and Sort Documents setup
+    gather_docs_frame = tk.LabelFrame(button_frame, text="Gather and Sort Documents", font=("Arial", 12), bg="#FFFFFF", padx=10, pady=10)
+    gather_docs_frame.pack(side="left", padx=20)
+    gather_docs_button = tk.Button(gather_docs_frame, text="Gather", font=("Arial", 10), width=15, command=gather_docs)
+    gather_docs_button.pack(pady=5)
+    preview_gather_button = tk.Button(gather_docs_frame, text="Preview", font=("Arial", 10), width=15, command=preview_gather)
+    preview_gather_button.pack(pady=5)
+    gather_docs_status = tk.Label(gather_docs_frame, text="Not done", font=("Arial", 10), bg="#FFFFFF")
+    gather_docs_status.pack()
+
+    # Generate MD Files setup
+    generate_md_frame = tk.LabelFrame(button_frame, text="Generate MD Files", font=("Arial", 12), bg="#FFFFFF", padx=10, pady=10)
+    generate_md_frame.pack(side="left", padx=20)
+    generate_md_button = tk.Button(generate_md_frame, text="Generate", font=("Arial", 10), width=15, command=generate_md_files)
+    generate_md_button.pack(pady=5)
+    generate_md_status = tk.Label(generate_md_frame, text="Not done", font=("Arial", 10), bg="#FFFFFF")
+    generate_md_status.pack()
+
+    # Update Document Tracker setup
+    update_tracker_frame = tk.LabelFrame(button_frame, text="Update Document Tracker", font=("Arial", 12), bg="#FFFFFF", padx=10, pady=10)
+    update_tracker_frame.pack(side="left", padx=20)
+    update_tracker_button = tk.Button(update_tracker_frame, text="Update", font=("Arial", 10), width=15, command=update_tracker)
+    update_tracker_button.pack(pady=5)
+    update_tracker_status = tk.Label(update_tracker_frame, text="Not done", font=("Arial", 10), bg="#FFFFFF")
+    update_tracker_status.pack()
+
+    # Additional buttons setup
+    additional_buttons_frame = tk.Frame(options_screen, bg="#F0F0F0")
+    additional_buttons_frame.pack(pady=20)
+
+    output_progress_button = tk.Button(additional_buttons_frame, text="Output progress", font=("Arial", 12), width=15, command=output_progress)
+    output_progress_button.pack(side="left", padx=10)
+
+    add_redo_scc_button = tk.Button(additional_buttons_frame, text="Add or redo an SCC", font=("Arial", 12), width=20, command=add_or_redo_scc)
+    add_redo_scc_button.pack(side="left", padx=10)
+
+    remove_scc_button = tk.Button(additional_buttons_frame, text="Remove an SCC", font=("Arial", 12), width=20, command=remove_scc)
+    remove_scc_button.pack(side="left", padx=10)
+
+    sync_button = tk.Button(additional_buttons_frame, text="Sync", font=("Arial", 12), width=15, command=sync_button_click)
+    sync_button.pack(side="left", padx=10)
+
+    dashboard_button = tk.Button(additional_buttons_frame, text="Dashboard", font=("Arial", 12), width=15, command=show_dashboard)
+    dashboard_button.pack(side="right", padx=10)
+
+    # Gather and pull progress setup
+    progress_frame = tk.Frame(options_screen, bg="#F0F0F0")
+    progress_frame.pack(pady=10)
+
+    progress_bar = ttk.Progressbar(progress_frame, orient="horizontal", length=600, mode="determinate")
+    progress_bar.pack(side="left", padx=10)
+
+    cancel_button = tk.Button(progress_frame, text="Cancel", font=("Arial", 10), width=10, state="disabled", command=cancel_background_task)
+    cancel_button.pack(side="left", padx=10)
+
+    progress_label = tk.Label(options_screen, text="", font=("Arial", 10), bg="#F0F0F0")
+    progress_label.pack()
+
+    # Selected Directories setup
+    directory_labels_frame = tk.LabelFrame(options_screen, text="Selected Directories", font=("Arial", 12), bg="#FFFFFF", padx=10, pady=10)
+    directory_labels_frame.pack(pady=40)
+
+    directory_canvas = tk.Canvas(directory_labels_frame, bg="#FFFFFF", width=800)
+    directory_canvas.pack(side="left", fill="both", expand=True)
+
+    directory_scrollbar = tk.Scrollbar(directory_labels_frame, orient="vertical", command=directory_canvas.yview)
+    directory_scrollbar.pack(side="right", fill="y")
+
+    directory_canvas.configure(yscrollcommand=directory_scrollbar.set)
+    directory_canvas.bind("<Configure>", lambda e: directory_canvas.configure(scrollregion=directory_canvas.bbox("all")))
+
+    directory_frame = tk.Frame(directory_canvas, bg="#FFFFFF", width=800)
+    directory_canvas.create_window((0, 0), window=directory_frame, anchor="nw")
+
+    # BPERs Directory setup
+    bpers_frame = tk.Frame(directory_frame, bg="#FFFFFF")
+    bpers_frame.pack(anchor="w", pady=5)
+    bpers_dir_button = tk.Button(bpers_frame, text="Select", font=("Arial", 10), command=select_bpers_directory)
+    bpers_dir_button.pack(side="left", padx=10)
+    bpers_dir_label = tk.Label(bpers_frame, text="BPERs Directory: Not selected", font=("Arial", 10), bg="#FFFFFF")
+    bpers_dir_label.pack(side="left")
+
+    # Attestation Directory setup
+    attestation_frame = tk.Frame(directory_frame, bg="#FFFFFF")
+    attestation_frame.pack(anchor="w", pady=5)
+    attestation_dir_button = tk.Button(attestation_frame, text="Select", font=("Arial", 10), command=select_attestation_directory)
+    attestation_dir_button.pack(side="left", padx=10)
+    attestation_dir_label = tk.Label(attestation_frame, text="Attestation Directory: Not selected", font=("Arial", 10), bg="#FFFFFF")
+    attestation_dir_label.pack(side="left")
+
+    # Supporting Documents Directory setup
+    supporting_docs_frame = tk.Frame(directory_frame, bg="#FFFFFF")
+    supporting_docs_frame.pack(anchor="w", pady=5)
+    supporting_docs_dir_button = tk.Button(supporting_docs_frame, text="Select", font=("Arial", 10), command=select_supporting_docs_directory)
+    supporting_docs_dir_button.pack(side="left", padx=10)
+    supporting_docs_dir_label = tk.Label(supporting_docs_frame, text="Supporting Documents Directory: Not selected", font=("Arial", 10), bg="#FFFFFF")
+    supporting_docs_dir_label.pack(side="left")
+
+    # SCC Directory setup
+    scc_frame = tk.Frame(directory_frame, bg="#FFFFFF")
+    scc_frame.pack(anchor="w", pady=5)
+    scc_dir_button = tk.Button(scc_frame, text="Select", font=("Arial", 10), command=select_scc_directory)
+    scc_dir_button.pack(side="left", padx=10)
+    scc_dir_label = tk.Label(scc_frame, text="SCC Directory: Not selected", font=("Arial", 10), bg="#FFFFFF")
+    scc_dir_label.pack(side="left")
+
+    # Progress File setup
+    progress_file_frame = tk.Frame(directory_frame, bg="#FFFFFF")
+    progress_file_frame.pack(anchor="w", pady=5)
+    progress_file_button = tk.Button(progress_file_frame, text="Select", font=("Arial", 10), command=select_progress_file)
+    progress_file_button.pack(side="left", padx=10)
+    progress_file_label = tk.Label(progress_file_frame, text="Progress File: Not selected", font=("Arial", 10), bg="#FFFFFF")
+    progress_file_label.pack(side="left")
+
+    # Project Directory setup
+    project_dir_frame = tk.Frame(directory_frame, bg="#FFFFFF")
+    project_dir_frame.pack(anchor="w", pady=5)
+    project_dir_button = tk.Button(project_dir_frame, text="Select", font=("Arial", 10), command=select_project_directory)
+    project_dir_button.pack(side="left", padx=10)
+    project_dir_label = tk.Label(project_dir_frame, text="Project Directory: Not selected", font=("Arial", 10), bg="#FFFFFF")
+    project_dir_label.pack(side="left")
+
+    # Template Directory setup
+    template_dir_frame = tk.Frame(directory_frame, bg="#FFFFFF")
+    template_dir_frame.pack(anchor="w", pady=5)
+    template_dir_button = tk.Button(template_dir_frame, text="Select", font=("Arial", 10), command=select_template_directory)
+    template_dir_button.pack(side="left", padx=10)
+    template_dir_label = tk.Label(template_dir_frame, text="Template Directory: Not selected", font=("Arial", 10), bg="#FFFFFF")
+    template_dir_label.pack(side="left")
+
+    # Gather Docs screen setup
+    gather_docs_screen = tk.Frame(root)
+    gather_docs_label = tk.Label(gather_docs_screen, text="Select Document Repositories")
+    gather_docs_label.pack(pady=20)
+    gather_docs_buttons_frame = tk.Frame(gather_docs_screen)
+    gather_docs_buttons_frame.pack(pady=20)
+
+    sort_button = tk.Button(gather_docs_screen, text="Sort!", command=sort_docs)
+    sort_button.pack(pady=20)
+
+    # Error label setup
+    error_label = tk.Label(root, text="", fg="red")
+    error_label.pack(pady=10)
+
+    # Dashboard screen setup
+    dashboard_screen = tk.Frame(root, bg="#F0F0F0")
+
+    back_button = tk.Button(dashboard_screen, text="Back", font=("Arial", 12), width=15, command=show_options)
+    back_button.pack(side="bottom", padx=10, pady=10)
+
+    # Section 1 (SCC List) setup
+    section1_frame = tk.Frame(dashboard_screen, bg="#FFFFFF", padx=10, pady=10)
+    section1_frame.pack(side="left", fill="both", expand=True)
+
+    section2_frame = tk.Frame(dashboard_screen, bg="#FFFFFF", padx=10, pady=10)
+    section2_frame.pack(side="left", fill="both", expand=True)
+
+    section2_label = tk.Label(section2_frame, text="Items Not Gathered", font=("Arial", 12, "bold"), bg="#FFFFFF")
+    section2_label.pack(pady=10)
+
+    # Items Not Gathered (Attestations) setup
+    not_gathered_attestations_label = tk.Label(section2_frame, text="Attestations", font=("Arial", 10, "bold"), bg="#FFFFFF")
+    not_gathered_attestations_label.pack(pady=5)
+    not_gathered_attestations_listbox = tk.Listbox(section2_frame, font=("Arial", 10), bg="#FFFFFF", selectmode="multiple")
+    not_gathered_attestations_listbox.pack(fill="both", expand=True)
+
+    attestations_buttons_frame = tk.Frame(section2_frame)
+    attestations_buttons_frame.pack(pady=5)
+    mark_attestation_false_positive_button = tk.Button(attestations_buttons_frame, text="Mark as False Positive", font=("Arial", 10), command=lambda: mark_as_false_positive("Attestations"))
+    mark_attestation_false_positive_button.pack(side="left", padx=5)
+    manually_link_attestations_button = tk.Button(attestations_buttons_frame, text="Assign Match", font=("Arial", 10), command=lambda: manually_link_files("Attestations"))
+    manually_link_attestations_button.pack(side="left", padx=5)
+
+    not_gathered_bpers_label = tk.Label(section2_frame, text="BPERs", font=("Arial", 10, "bold"), bg="#FFFFFF")
+    not_gathered_bpers_label.pack(pady=5)
+    not_gathered_bpers_listbox = tk.Listbox(section2_frame, font=("Arial", 10), bg="#FFFFFF", selectmode="multiple")
+    not_gathered_bpers_listbox.pack(fill="both", expand=True)
+
+    bpers_buttons_frame = tk.Frame(section2_frame)
+    bpers_buttons_frame.pack(pady=5)
+    mark_bper_false_positive_button = tk.Button(bpers_buttons_frame, text="Mark as False Positive", font=("Arial", 10), command=lambda: mark_as_false_positive("BPERs"))
+    mark_bper_false_positive_button.pack(side="left", padx=5)
+    manually_link_bpers_button = tk.Button(bpers_buttons_frame, text="Assign Match", font=("Arial", 10), command=lambda: manually_link_files("BPERs"))
+    manually_link_bpers_button.pack(side="left", padx=5)
+
+    # Items Not Gathered (Documents) setup 
+    not_gathered_documents_label = tk.Label(section2_frame, text="Documents", font=("Arial", 10, "bold"), bg="#FFFFFF")
+    not_gathered_documents_label.pack(pady=5)
+    not_gathered_documents_listbox = tk.Listbox(section2_frame, font=("Arial", 10), bg="#FFFFFF", selectmode="multiple")
+    not_gathered_documents_listbox.pack(fill="both", expand=True)
+
+    documents_buttons_frame = tk.Frame(section2_frame)
+    documents_buttons_frame.pack(pady=5)
+    mark_document_false_positive_button = tk.Button(documents_buttons_frame, text="Mark as False Positive", font=("Arial", 10), command=lambda: mark_as_false_positive("Documents"))
+    mark_document_false_positive_button.pack(side="left", padx=5)
+    manually_link_documents_button = tk.Button(documents_buttons_frame, text="Assign Match", font=("Arial", 10), command=lambda: manually_link_files("Documents"))
+    manually_link_documents_button.pack(side="left", padx=5)
+
+    # Section 3 (Dates and Chart) setup 
+    section3_frame = tk.Frame(dashboard_screen, bg="#FFFFFF", padx=10, pady=10)
+    section3_frame.pack(side="left", fill="both", expand=True)
+
+    section1_label = tk.Label(section1_frame, text="SCC List", font=("Arial", 12), bg="#FFFFFF")
+    section1_label.pack(pady=10)
+
+    scc_listbox = tk.Listbox(section1_frame, font=("Arial", 10), bg="#FFFFFF")
+    scc_listbox.pack(fill="both", expand=True)
+    scc_listbox.bind("<Double-Button-1>", open_scc_markdown_file)
+
+    section3_label = tk.Label(section3_frame, text="Dates and Chart", font=("Arial", 12), bg="#FFFFFF")
+    section3_label.pack(pady=10)
+
+    last_info_pull_label = tk.Label(section3_frame, text="Last Info Pull: N/A", font=("Arial", 10), bg="#FFFFFF")
+    last_info_pull_label.pack(pady=5)
+
+    last_doc_pull_label = tk.Label(section3_frame, text="Last Doc Pull: N/A", font=("Arial", 10), bg="#FFFFFF")
+    last_doc_pull_label.pack(pady=5)
+
+    last_checklist_generated_label = tk.Label(section3_frame, text="Last Checklist Generated: N/A", font=("Arial", 10), bg="#FFFFFF")
+    last_checklist_generated_label.pack(pady=5)
+
+    # Placeholder for the pie chart
+    pie_chart_label = tk.Label(section3_frame, text="", font=("Arial", 10), bg="#FFFFFF", justify="center")
+    pie_chart_label.pack(pady=10)
+
+    # Show the welcome screen initially
+    show_welcome()
+    root.mainloop()
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 import SCCREAD
-import SCCCHECK
+import SCCCACHE
+import FILECACHE
 import SCCTABLES
 import SPLITBPER
 import FILEGRAB
@@ -10,6 +11,7 @@ import shutil
 import sys
 import re
 import docx
+import concurrent.futures
 from datetime import datetime
 
 def read_json(filename): #needed for opening progress.json
@@ -50,6 +52,68 @@ def update_dict(all_dict, new_entries): # check the dictionary to make sure any
             all_dict[key] = []
         all_dict[key].append(value)
 
+def merge_scc_items(all_dict, new_entries, scc_name): # diff one SCC's items against what's stored; adds new ones, retires removed ones, leaves unchanged ones alone
+    added = kept = retired = 0
+    for key in list(all_dict.keys()):
+        if key in new_entries:
+            continue
+        remaining = [value for value in all_dict[key] if value.get('SCC') != scc_name] # no longer in this SCC
+        retired += len(all_dict[key]) - len(remaining)
+        if remaining:
+            all_dict[key] = remaining
+        else:
+            del all_dict[key]
+
+    for key, value in new_entries.items():
+        existing = [stored for stored in all_dict.get(key, []) if stored.get('SCC') == scc_name]
+        if existing:
+            kept += 1 # keeps 'Gathered', 'manually_linked', extracted dates, etc.
+        else:
+            all_dict.setdefault(key, []).append(value)
+            added += 1
+    return added, kept, retired
+
+def reingest_scc(progress_data, file_path, scc_result): # merge a new revision of an SCC into progress_data, only changed items lose their state, returns None and changes nothing if the revision couldn't be read
+    bper_dict, doc_dict, attestation_dict, method_dict, scc_info = scc_result
+    scc_name = re.sub(r'_\d{2}$', '', os.path.splitext(os.path.basename(file_path))[0]).strip()
+    if not scc_info: # load failed, diffing against the empty results would retire everything stored for this SCC
+        print(f"Failed to read {file_path}, {scc_name} was not updated")
+        return None
+    summary = {}
+
+    for key, new_entries in [('BPERs', bper_dict), ('Attestations', attestation_dict), ('Documents', doc_dict)]:
+        summary[key] = merge_scc_items(progress_data.setdefault(key, {}), new_entries, scc_name)
+
+    checks = progress_data.setdefault('Checks', {})
+    added = kept = retired = 0
+    for stig_id in [stig_id for stig_id, details in checks.items() if details.get('SCC') == scc_name and stig_id not in method_dict]:
+        del checks[stig_id]
+        retired += 1
+    for stig_id, details in method_dict.items():
+        if stig_id in checks and checks[stig_id].get('SCC') == scc_name:
+            checks[stig_id]['Evidence method'] = details['Evidence Method'] # method may have changed, anything else stored is kept
+            kept += 1
+        else:
+            checks[stig_id] = {
+                'SCC': scc_name,
+                'Evidence method': details['Evidence Method']
+            }
+            added += 1
+    summary['Checks'] = (added, kept, retired)
+
+    scc_dict = progress_data.setdefault('SCC', {})
+    old_scc_info = {}
+    for old_path in [path for path, details in scc_dict.items() if details.get('SCC') == scc_name]:
+        old_scc_info = scc_dict.pop(old_path) # the new revision is keyed by its own path
+    for setting in ['Directory built', 'Info Doc Path']: # state built up for the SCC, not read from the file
+        if setting in old_scc_info:
+            scc_info[setting] = old_scc_info[setting]
+    scc_dict[file_path] = convert_datetime_to_string(scc_info)
+
+    for key, (added, kept, retired) in summary.items():
+        print(f"{scc_name} {key}: {added} added, {kept} unchanged, {retired} retired")
+    return summary
+
 def replace_text_in_docx(doc_path, replacements): #supports filling in some of the templates
     doc = docx.Document(doc_path)
 
@@ -203,7 +267,13 @@ def move_sccs_to_folders(project_dir, file_extensions): # moves the scc's into t
             else:
                 print(f"Destination folder not found for {file}, expected at {dest_folder_path}")
 
-def build_progress_json(directory_path, project_dir):
+def load_scc_files(file_paths, workers=1): # parses each SCC, in a pool of worker processes when workers > 1, results come back in file_paths order
+    if workers > 1 and len(file_paths) > 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=min(workers, len(file_paths))) as executor:
+            return list(executor.map(SCCREAD.load_scc_file, file_paths))
+    return [SCCREAD.load_scc_file(file_path) for file_path in file_paths]
+
+def build_progress_json(directory_path, project_dir, workers=1):
     #Master dictionaries
     all_bper_dict = {}
     all_doc_dict = {}
@@ -211,32 +281,37 @@ def build_progress_json(directory_path, project_dir):
     scc_data_dict = {}
     checks_data_dict = {}
 
-    #Loop for all excel files in directory
-    for file in os.listdir(directory_path):
-        if file.endswith('.xlsx') or file.endswith('.xls'):
-            file_path = os.path.join(directory_path, file)
-
-            #This creates the dictionaries using SCCREAD (bper, docs, atts, controls)
-            bper_dict, doc_dict, attestation_dict, method_dict = SCCREAD.process_excel_file(file_path)
-
-            #This creates the scc_info dictionary (first page check, etc)
-            scc_info = SCCCHECK.process_scc_file(file_path)
-
-            #stores in master dict
-            update_dict(all_bper_dict, bper_dict)
-            update_dict(all_attestation_dict, attestation_dict)
-            update_dict(all_doc_dict, doc_dict)
-
-            # Update scc_data_dict and checks_data_dict
-            scc_data_dict[file_path] = scc_info
-            for stig_id, details in method_dict.items():
-                # Extract SCC name from the file path and remove extension and trailing "_**"
-                scc_name = os.path.splitext(os.path.basename(file_path))[0]
-                scc_name = re.sub(r'_\d{2}$', '', scc_name).strip()
-                checks_data_dict[stig_id] = {
-                    'SCC': scc_name,
-                    'Evidence method': details['Evidence Method']
-                }
+    #All excel files in directory
+    file_paths = [os.path.join(directory_path, file) for file in os.listdir(directory_path) if file.endswith('.xlsx') or file.endswith('.xls')]
+
+    #This creates the dictionaries (bper, docs, atts, controls) and the scc_info dictionary (first page check, etc) from one read of each SCC
+    #SCCs that haven't changed since the last build come from the cache next to progress.json, only the rest get parsed
+    scc_cache = SCCCACHE.load_cache(project_dir)
+    scc_results = [SCCCACHE.get_cached_scc(scc_cache, file_path) for file_path in file_paths]
+    changed_indexes = [index for index, scc_result in enumerate(scc_results) if scc_result is None]
+    parsed_results = load_scc_files([file_paths[index] for index in changed_indexes], workers)
+    for index, scc_result in zip(changed_indexes, parsed_results):
+        SCCCACHE.store_scc(scc_cache, file_paths[index], scc_result)
+        scc_results[index] = scc_result
+    FILECACHE.save_cache(scc_cache)
+
+    #Merged in directory order so progress.json is the same however many workers were used
+    for file_path, (bper_dict, doc_dict, attestation_dict, method_dict, scc_info) in zip(file_paths, scc_results):
+        #stores in master dict
+        update_dict(all_bper_dict, bper_dict)
+        update_dict(all_attestation_dict, attestation_dict)
+        update_dict(all_doc_dict, doc_dict)
+
+        # Update scc_data_dict and checks_data_dict
+        scc_data_dict[file_path] = scc_info
+        for stig_id, details in method_dict.items():
+            # Extract SCC name from the file path and remove extension and trailing "_**"
+            scc_name = os.path.splitext(os.path.basename(file_path))[0]
+            scc_name = re.sub(r'_\d{2}$', '', scc_name).strip()
+            checks_data_dict[stig_id] = {
+                'SCC': scc_name,
+                'Evidence method': details['Evidence Method']
+            }
 
     # Save progress to progress.json
     progress_data = {
@@ -252,7 +327,8 @@ def build_progress_json(directory_path, project_dir):
             'Gather and Sort Date': '',
             'Doc Tracker Update': '',
             'Pull Info Date': '',
-            'Checklists generated':''
+            'Checklists generated':'',
+            'Placement Mode': 'copy'
         }
     }
     with open(os.path.join(project_dir, 'progress.json'), 'w') as file:
@@ -382,10 +458,8 @@ def main():
                 print(f"Skipping already processed file: {file_path}")
                 continue
 
-            #This creates the dictionaries using SCCREAD (bper, docs, atts, controls)
-            bper_dict, doc_dict, attestation_dict, method_dict = SCCREAD.process_excel_file(file_path)
-            #This creates the scc_info dictionary (first page check, etc)
-            scc_info = SCCCHECK.process_scc_file(file_path)
+            #This creates the dictionaries (bper, docs, atts, controls) and the scc_info dictionary (first page check, etc) from one read of the SCC
+            bper_dict, doc_dict, attestation_dict, method_dict, scc_info = SCCREAD.load_scc_file(file_path)
 
             #This creates the directories for each SCC
             build_templates(master_directory)
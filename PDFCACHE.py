@@ -0,0 +1,56 @@
+import os
+import FILEGRAB
+import FILECACHE
+
+cache_filename = 'extract_cache.json' # in the project directory, beside progress.json
+extractor_versions = { # bump one of these when its extractor changes what it returns, the cached results it made are then ignored
+    'BPER': FILEGRAB.bper_extractor_version,
+    'Attestation': FILEGRAB.attestation_extractor_version
+}
+
+def load_cache(project_dir): # load the extracted PDF fields, each extractor's results carry its own version
+    return FILECACHE.load_cache(os.path.join(project_dir, cache_filename), 'PDFs', 'PDF extraction cache')
+
+def get_extracted(cache, file_path, extractor): # cached fields from one extractor, or None if the PDF has to be read
+    entry = FILECACHE.find_entry(cache, file_path)
+    extracted = entry.get(extractor) if entry else None
+    if extracted is None or extracted['version'] != extractor_versions[extractor]:
+        cache['misses'] += 1
+        return None
+    cache['hits'] += 1
+    return tuple(extracted['fields'])
+
+def store_extracted(cache, file_path, extractor, fields):
+    entry = FILECACHE.get_entry(cache, file_path)
+    entry[extractor] = {'version': extractor_versions[extractor], 'fields': list(fields)}
+
+def is_failed(extractor, fields): # the extractors report a PDF they couldn't read through the status field, those aren't cached so they're tried again next time
+    return fields[1 if extractor == 'BPER' else 0] == "Status: Error"
+
+def store_result(cache, file_path, extractor, fields): # store_extracted, unless the read failed
+    if not is_failed(extractor, fields):
+        store_extracted(cache, file_path, extractor, fields)
+
+def extract_bper_info(file_path, cache=None, stats=None): # FILEGRAB.extract_BPER_info, the PDF is only read if it changed since its fields were stored, stats is left empty on a hit
+    if cache is None:
+        return FILEGRAB.extract_BPER_info(file_path, stats)
+    fields = get_extracted(cache, file_path, 'BPER')
+    if fields is None:
+        fields = FILEGRAB.extract_BPER_info(file_path, stats)
+        store_result(cache, file_path, 'BPER', fields)
+    return fields
+
+def extract_attestation_info(file_path, cache=None): # FILEGRAB.extract_attestation_pdf_info, same as extract_bper_info
+    if cache is None:
+        return FILEGRAB.extract_attestation_pdf_info(file_path)
+    fields = get_extracted(cache, file_path, 'Attestation')
+    if fields is None:
+        fields = FILEGRAB.extract_attestation_pdf_info(file_path)
+        store_result(cache, file_path, 'Attestation', fields)
+    return fields
+
+def main(): # for clearing the cache from the command line
+    FILECACHE.invalidate_from_command_line(load_cache, 'PDF')
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import os
+from datetime import datetime
+import SCCREAD
+import SCCCHECK
+import FILECACHE
+
+cache_filename = 'scc_cache.json' # lives next to progress.json
+
+def load_cache(project_dir): # load the parsed SCC snapshots, parses from an older SCCREAD or checks from an older SCCCHECK are thrown out
+    versions = {'Parser version': SCCREAD.parser_version, 'Check version': SCCCHECK.check_version}
+    return FILECACHE.load_cache(os.path.join(project_dir, cache_filename), 'SCCs', 'SCC cache', versions)
+
+def store_check(scc_info): # datetimes don't go in json
+    scc_info = dict(scc_info)
+    if isinstance(scc_info.get('Last Review Date'), datetime):
+        scc_info['Last Review Date'] = scc_info['Last Review Date'].isoformat()
+    return scc_info
+
+def restore_check(scc_info): # bring the review date back to a datetime and redo the 180 day check, which depends on today's date
+    scc_info = dict(scc_info)
+    if isinstance(scc_info.get('Last Review Date'), str):
+        scc_info['Last Review Date'] = datetime.fromisoformat(scc_info['Last Review Date'])
+    if 'Reviewed within 180 days' in scc_info:
+        scc_info['Reviewed within 180 days'] = SCCCHECK.check_reviewed_within_days(scc_info.get('Last Review Date'))
+    return scc_info
+
+def get_cached_scc(cache, file_path): # cached load_scc_file output, or None if the SCC has to be parsed
+    entry = FILECACHE.find_entry(cache, file_path)
+    if entry is None or entry.get('read') is None or entry.get('check') is None:
+        cache['misses'] += 1
+        return None
+    cache['hits'] += 1
+    bper_dict, doc_dict, attestation_dict, method_dict = entry['read']
+    return bper_dict, doc_dict, attestation_dict, method_dict, restore_check(entry['check'])
+
+def store_scc(cache, file_path, scc_result): # store load_scc_file output, SCCs that failed to open aren't stored
+    bper_dict, doc_dict, attestation_dict, method_dict, scc_info = scc_result
+    if not scc_info:
+        return
+    entry = FILECACHE.get_entry(cache, file_path)
+    entry['read'] = [bper_dict, doc_dict, attestation_dict, method_dict]
+    entry['check'] = store_check(scc_info)
+
+def load_scc_file(file_path, cache): # SCCREAD.load_scc_file with the cache in front of it
+    scc_result = get_cached_scc(cache, file_path)
+    if scc_result is None:
+        scc_result = SCCREAD.load_scc_file(file_path)
+        store_scc(cache, file_path, scc_result)
+    return scc_result
+
+def process_excel_file(file_path, cache): # SCCREAD.process_excel_file with the cache in front of it
+    entry = FILECACHE.find_entry(cache, file_path)
+    if entry is not None and entry.get('read') is not None:
+        cache['hits'] += 1
+        return tuple(entry['read'])
+
+    cache['misses'] += 1
+    bper_dict, doc_dict, attestation_dict, method_dict = SCCREAD.process_excel_file(file_path)
+    if bper_dict or doc_dict or attestation_dict or method_dict:
+        FILECACHE.get_entry(cache, file_path)['read'] = [bper_dict, doc_dict, attestation_dict, method_dict]
+    return bper_dict, doc_dict, attestation_dict, method_dict
+
+def process_scc_file(file_path, cache): # SCCCHECK.process_scc_file with the cache in front of it
+    entry = FILECACHE.find_entry(cache, file_path)
+    if entry is not None and entry.get('check') is not None:
+        cache['hits'] += 1
+        return restore_check(entry['check'])
+
+    cache['misses'] += 1
+    scc_info = SCCCHECK.process_scc_file(file_path)
+    if scc_info:
+        FILECACHE.get_entry(cache, file_path)['check'] = store_check(scc_info)
+    return scc_info
+
+def main(): # for clearing the cache from the command line
+    FILECACHE.invalidate_from_command_line(load_cache, 'SCC')
+
+if __name__ == "__main__":
+    main()
@@ -2,33 +2,26 @@ import openpyxl
 import re
 import argparse
 import os
+import SCCHEADERS
 from datetime import datetime
 
-def read_excel(file_path): # Load an Excel workbook from the specified file path
+check_version = 2 # bump when process_scc_file/check_workbook changes what it returns, cached checks from older versions get redone
+
+def read_excel(file_path, read_only=True): # Load an Excel workbook from the specified file path
     try:
-        workbook = openpyxl.load_workbook(file_path, data_only=True)
-        return workbook
+        workbook = openpyxl.load_workbook(file_path, read_only=read_only, data_only=True)
+        return SCCHEADERS.reset_dimensions(workbook) # the stored dimension can be stale, the title page and header rows are read to the real end
     except PermissionError:
         print(f"Permission denied: Unable to access '{file_path}'.") # handles files that are open somewhere else
         return None
 
-def find_value_with_regex(sheet, pattern, max_diff=5, max_rows=150, max_cols=50): # Find the first cell that matches a regex pattern in the specified Excel sheet
-    if isinstance(pattern, str):
-        compiled_pattern = re.compile(pattern, re.IGNORECASE)
-    else:
-        compiled_pattern = pattern  
-
-    for row in sheet.iter_rows(min_row=1, max_row=max_rows, max_col=max_cols, values_only=True):
-        for cell in row:
-            if cell and regex_match_with_diff(compiled_pattern, str(cell), max_diff):
-                return str(cell)
-    return False
-
-def regex_match_with_diff(pattern, text, max_diff): # Match text to a regex pattern, allowing for flexible slicing within max_diff
-    for i in range(len(text) - max_diff + 1):
-        for j in range(i + 1, len(text) + 1):
-            if pattern.fullmatch(text[i:j]):
-                return True
+def regex_search_with_diff(pattern, text, max_diff): # Match text to a regex pattern anywhere in the cell, a match has to start at least max_diff characters before the end of the text
+    last_start = min(len(text) - max_diff, len(text) - 1)
+    match = pattern.search(text)
+    while match and match.start() <= last_start:
+        if match.end() > match.start(): # an empty match doesn't count, same as the sliced version
+            return True
+        match = pattern.search(text, match.start() + 1)
     return False
 
 def find_most_recent_date(sheet, max_rows=150): # Find most recent review date 
@@ -40,13 +33,33 @@ def find_most_recent_date(sheet, max_rows=150): # Find most recent review date
                     latest_date = cell
     return latest_date
 
-def check_column_presence(workbook, column_name, max_cols=50): # Check if a column with certain name exists on all sheets except first
-    for sheet_name in workbook.sheetnames[1:]:
-        sheet = workbook[sheet_name]
-        for column in sheet.iter_cols(min_row=1, max_row=1, max_col=max_cols, values_only=True):
-            if column[0] and column_name.lower() in column[0].lower():
-                return True
-    return False
+def check_column_presence(workbook, column_name, header_index=None): # Check if a column with certain name exists on all sheets except first
+    return SCCHEADERS.has_column(SCCHEADERS.build_workbook_index(workbook, header_index), column_name)
+
+def scan_title_sheet(sheet, patterns, max_rows=150, max_cols=50): # Walk the title sheet once, checking every pattern and keeping the most recent date
+    matches = {name: False for name in patterns} # patterns is name: (compiled pattern, max_diff)
+    latest_date = None
+    for row in sheet.iter_rows(min_row=1, max_row=max_rows, values_only=True):
+        for col_index, cell in enumerate(row):
+            if not cell:
+                continue
+            if isinstance(cell, datetime): # grabs all that are dates and compares for most recent
+                if not latest_date or cell > latest_date:
+                    latest_date = cell
+            if col_index >= max_cols:
+                continue
+            text = None
+            for name, (pattern, max_diff) in patterns.items():
+                if matches[name] is False: # only the first matching cell is kept
+                    if text is None:
+                        text = str(cell)
+                    if regex_search_with_diff(pattern, text, max_diff):
+                        matches[name] = text
+    return matches, latest_date
+
+def scan_header_rows(workbook, column_names, header_index=None): # Check for every column name using the header index, each header row is read at most once
+    header_index = SCCHEADERS.build_workbook_index(workbook, header_index)
+    return {column_name: SCCHEADERS.has_column(header_index, column_name) for column_name in column_names}
 
 def check_reviewed_within_days(last_review_date, days=180): # Check if the last review date is within the specified number of days from today
     if last_review_date:
@@ -61,11 +74,21 @@ def process_scc_file(file_path): # Run checks on SCC file
         print(f"Skipping file due to error: {file_path}") # error handling
         return {}
 
+    try:
+        return check_workbook(workbook, file_path)
+    finally:
+        workbook.close() # read only workbooks keep the file open until closed
+
+def check_workbook(workbook, file_path, header_index=None): # Run checks on an already loaded SCC workbook, header_index can come from SCCREAD.process_workbook
     first_sheet = workbook[workbook.sheetnames[0]]
-    scm_pattern = re.compile(r'SCM\d+', re.IGNORECASE)
-    guidance_pattern = re.compile(r'SCC Guidance Source', re.IGNORECASE)
-    policy_procedure_pattern = re.compile(r'SCC Policy and Procedures Source', re.IGNORECASE)
-    system_scope_pattern = re.compile(r'SCC System Scope', re.IGNORECASE)
+    title_patterns = {
+        'scm': (re.compile(r'SCM\d+', re.IGNORECASE), 0),
+        'guidance': (re.compile(r'SCC Guidance Source', re.IGNORECASE), 5),
+        'policy procedure': (re.compile(r'SCC Policy and Procedures Source', re.IGNORECASE), 5),
+        'system scope': (re.compile(r'SCC System Scope', re.IGNORECASE), 3)
+    }
+    title_matches, last_review_date = scan_title_sheet(first_sheet, title_patterns) # one pass over the title page
+    columns = scan_header_rows(workbook, ['exception', 'deviation', 'TLA', 'method', 'documentation'], header_index) # header rows are only read if they aren't indexed yet
 
     # Extract SCC name from the file path and remove extension
     scc_name = os.path.splitext(os.path.basename(file_path))[0]
@@ -81,17 +104,17 @@ def process_scc_file(file_path): # Run checks on SCC file
     scc_info = {
         'SCC': scc_name,
         'Version': version,
-        'SCM Name': find_value_with_regex(first_sheet, scm_pattern, 0),
-        'Last Review Date': find_most_recent_date(first_sheet),
-        'SCC Guidance source presence': bool(find_value_with_regex(first_sheet, guidance_pattern, 5)),
-        'SCC Policy and Procedure presence': bool(find_value_with_regex(first_sheet, policy_procedure_pattern, 5)),
-        'Exception column presence': check_column_presence(workbook, 'exception'),
-        'Deviation column presence': check_column_presence(workbook, 'deviation'),
-        'TLA column presence': check_column_presence(workbook, 'TLA'),
-        'Compliance method column presence': check_column_presence(workbook, 'method'),
-        'WPS config sup doc presence': check_column_presence(workbook, 'documentation'),
-        'Reviewed within 180 days': check_reviewed_within_days(find_most_recent_date(first_sheet)),
-        'SCC System Scope Presence': bool(find_value_with_regex(first_sheet, system_scope_pattern, 3)),
+        'SCM Name': title_matches['scm'],
+        'Last Review Date': last_review_date,
+        'SCC Guidance source presence': bool(title_matches['guidance']),
+        'SCC Policy and Procedure presence': bool(title_matches['policy procedure']),
+        'Exception column presence': columns['exception'],
+        'Deviation column presence': columns['deviation'],
+        'TLA column presence': columns['TLA'],
+        'Compliance method column presence': columns['method'],
+        'WPS config sup doc presence': columns['documentation'],
+        'Reviewed within 180 days': check_reviewed_within_days(last_review_date),
+        'SCC System Scope Presence': bool(title_matches['system scope']),
         'Directory built': False
     }
 
@@ -0,0 +1,47 @@
+max_header_cols = 50 # only the first 50 columns are checked for headers
+
+def build_sheet_index(header_row, max_cols=max_header_cols): # index of one header row: lowercase header text and the columns feeding each extractor
+    headers = []
+    column_roles = []
+    for col_index, header in enumerate((header_row or ())[:max_cols]):
+        if not header:
+            headers.append(None)
+            continue
+        header = str(header).lower() # grab the header
+        headers.append(header)
+
+        if 'exception' in header or 'deviation' in header: # BPER names
+            column_roles.append((col_index, 'exception'))
+        elif 'documentation' in header: # document names and attestations
+            column_roles.append((col_index, 'documentation'))
+        elif 'method' in header: # compliance methods
+            column_roles.append((col_index, 'method'))
+
+    return {'headers': headers, 'column roles': column_roles}
+
+def read_header_row(sheet, max_cols=max_header_cols): # the first row of a sheet, None if the sheet is empty
+    for header_row in sheet.iter_rows(min_row=1, max_row=1, max_col=max_cols, values_only=True):
+        return header_row
+    return None
+
+def reset_dimensions(workbook): # read only sheets stop at the stored <dimension>, which exported SCCs often leave stale, so make them read to the real end of the data
+    for sheet in workbook.worksheets:
+        if hasattr(sheet, 'reset_dimensions'): # only read only sheets have it
+            sheet.reset_dimensions()
+    return workbook
+
+def build_workbook_index(workbook, header_index=None): # header index for every sheet except the first, only sheets not already indexed get read
+    if header_index is None:
+        header_index = {}
+    for sheet_name in workbook.sheetnames[1:]:
+        if sheet_name not in header_index:
+            header_index[sheet_name] = build_sheet_index(read_header_row(workbook[sheet_name]))
+    return header_index
+
+def has_column(header_index, column_name): # check if a column with certain name exists on any indexed sheet
+    column_name = column_name.lower()
+    for sheet_index in header_index.values():
+        for header in sheet_index['headers']:
+            if header and column_name in header:
+                return True
+    return False
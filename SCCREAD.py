@@ -2,11 +2,19 @@ import openpyxl
 import re
 import argparse
 import os
+import SCCCHECK
+import SCCHEADERS
 
-def read_excel(file_path): #error handling for file opening
+attestation_pattern = re.compile(r'(?<!\w)\d{6}(?!\w)') # matching for attestations
+bper_pattern = re.compile(r'BPER\d{7}')  # Regular expression pattern for BPER000****
+doc_split_pattern = re.compile(r'\s{2,}|\r?\n')
+placeholder_names = {'NA', 'N/A', 'NO', 'NONE'}
+parser_version = 2 # bump when the extracted output changes, cached parses from older versions get redone
+
+def read_excel(file_path, read_only=True): #error handling for file opening, read only mode streams rows instead of loading every cell
     try:
-        workbook = openpyxl.load_workbook(file_path, data_only=True)
-        return workbook
+        workbook = openpyxl.load_workbook(file_path, read_only=read_only, data_only=True)
+        return SCCHEADERS.reset_dimensions(workbook)
     except PermissionError:
         print(f"Permission denied: Unable to access '{file_path}'. The file may be open in another program.")
     except ValueError as e:
@@ -16,16 +24,20 @@ def read_excel(file_path): #error handling for file opening
 
     return None
 
-def find_unique_values(sheet, column_index): #read a column and separate unique values
+def find_unique_values(sheet, column_index): #read a column and separate unique values, one pass to the end of the sheet's data so long checklists aren't cut off
     unique_values = set()
-    for row in sheet.iter_rows(min_row=2, max_row=1000, min_col=column_index, max_col=column_index, values_only=True):
-        cell_value = row[0]
+    for row in sheet.iter_rows(min_row=2, min_col=column_index, max_col=column_index, values_only=True):
+        cell_value = row[0] if row else None
         if cell_value:
             unique_values.add(str(cell_value))
     return unique_values
 
 def split_documentation_text(text): #split documents within cells separated by 4 or more spaces
-    return re.split(r'\s{2,}|\r?\n', text)
+    return doc_split_pattern.split(text)
+
+def get_scc_name(file_path): # Extract SCC name from the file path and remove extension and trailing "_**"
+    scc_name = os.path.splitext(os.path.basename(file_path))[0]
+    return re.sub(r'_\d{2}$', '', scc_name).strip()
 
 def process_excel_file(file_path): # just helps process_workbook, could be refined
     print(f'Processing {file_path}')
@@ -35,99 +47,129 @@ def process_excel_file(file_path): # just helps process_workbook, could be refin
         print(f"Skipping file due to error: {file_path}")
         return {}, {}, {}, {}  # Return empty dictionaries if the workbook couldn't be opened
 
-    bper_dict, doc_dict, attestation_dict, method_dict = process_workbook(workbook, file_path)
+    try:
+        bper_dict, doc_dict, attestation_dict, method_dict = process_workbook(workbook, file_path)
+    finally:
+        workbook.close() # read only workbooks keep the file open until closed
     
     return bper_dict, doc_dict, attestation_dict, method_dict
 
-def process_workbook(workbook, file_path): # grabs all the information from the SCC excel file and puts it into dictionaries
+def load_scc_file(file_path): # opens the SCC once and runs both the SCCREAD extraction and the SCCCHECK checks on it
+    print(f'Loading {file_path}')
+    workbook = read_excel(file_path)
+
+    if workbook is None:
+        print(f"Skipping file due to error: {file_path}")
+        return {}, {}, {}, {}, {}  # Return empty dictionaries if the workbook couldn't be opened
+
+    try:
+        header_index = {} # filled while the sheets are streamed, so SCCCHECK doesn't read the header rows again
+        bper_dict, doc_dict, attestation_dict, method_dict = process_workbook(workbook, file_path, header_index=header_index)
+        scc_info = SCCCHECK.check_workbook(workbook, file_path, header_index)
+    finally:
+        workbook.close()
+
+    return bper_dict, doc_dict, attestation_dict, method_dict, scc_info
+
+def extract_bpers(cell_value, scc_name, bper_dict): # grab all BPER names from an exception/deviation cell
+    for bper_value in bper_pattern.findall(str(cell_value)):  # Find all BPER values in the cell
+        bper_value = bper_value.strip()
+        if bper_value:
+            bper_dict[bper_value] = {  # BPER dict initialization
+                'SCC': scc_name,
+                'BPER name': bper_value,
+                'Approval Status': '',
+                'Valid to': '',
+                'Gathered': False,
+                'TLA': ''
+            }
+
+def extract_documents(cell_value, scc_name, doc_dict, attestation_dict): # grab all document names and attestations from a documentation cell
+    for doc_name in split_documentation_text(str(cell_value)): # create a list with all the document names
+        doc_name_for_comparison = doc_name.replace('\n', '').strip().upper()  # Normalize case for comparison
+
+        if doc_name_for_comparison in placeholder_names: # handles placeholders
+            continue
+
+        attestation_match = attestation_pattern.search(doc_name) # attestation logic placed here because they end up in this column
+        if attestation_match:
+            attestation_num = attestation_match.group() # adds all attestations that match the pattern
+            if attestation_num not in attestation_dict:
+                attestation_dict[attestation_num] = { # attestation dict initialization
+                    'SCC': scc_name,
+                    'Attestation num': attestation_num,
+                    'Gathered': False,
+                    'Approval Status': '',
+                    'Valid to': ''
+                }
+        else:
+            doc_name_final = re.sub(r'\b\d{6}\b', '', doc_name).strip()
+            if doc_name_final and doc_name_final not in doc_dict:
+                doc_dict[doc_name_final] = { # supporting document ditc initialization
+                    'SCC': scc_name,
+                    'Doc name': doc_name_final,
+                    'Version':'',
+                    'Last update': '',
+                    'Gathered': False                                        
+                }
+
+def extract_method(stig_id, cell_value, scc_name, method_dict): # grab the compliance method for a STIG ID
+    stig_id = str(stig_id)
+    method_dict[stig_id] = { # check method dict initialization
+        'SCC': scc_name,
+        'STIG ID': stig_id,
+        'Evidence Method': str(cell_value),
+        'compliant': '',
+        'Gathered': False
+    }
+
+def process_workbook(workbook, file_path, sheet_stats=None, header_index=None): # grabs all the information from the SCC excel file and puts it into dictionaries, fills sheet_stats with rows scanned per sheet and header_index with each sheet's headers if given
+    if sheet_stats is None:
+        sheet_stats = {}
+    if header_index is None:
+        header_index = {}
     bper_dict = {}
     doc_dict = {}
     attestation_dict = {}
     method_dict = {}
 
-    attestation_pattern = re.compile(r'(?<!\w)\d{6}(?!\w)') # matching for attestations
-
-    # Extract SCC name from the file path and remove extension and trailing "_**"
-    scc_name = os.path.splitext(os.path.basename(file_path))[0]
-    scc_name = re.sub(r'_\d{2}$', '', scc_name).strip()
+    scc_name = get_scc_name(file_path)
 
     for sheet_name in workbook.sheetnames[1:]: # check the headers on every tab except the first
         sheet = workbook[sheet_name]
-        col_index = 1  # Start from the first column
-        for column in sheet.iter_cols(min_row=1, max_row=1, max_col=50, values_only=True): # look through every column
-            header = column[0]
-            if not header:
-                col_index += 1
-                continue
-            header = str(header).lower() # grab the header
-
-            if 'exception' in header or 'deviation' in header:  # check header for this text and grab all BPER names
-                for row in sheet.iter_rows(min_row=2, max_row=sheet.max_row, min_col=col_index, max_col=col_index, values_only=True):
-                    cell_value = row[0]
-                    if cell_value:
-                        cell_value_str = str(cell_value)
-                        bper_pattern = re.compile(r'BPER\d{7}')  # Regular expression pattern for BPER000****
-                        bper_values = bper_pattern.findall(cell_value_str)  # Find all BPER values in the cell
-                        
-                        for bper_value in bper_values:
-                            bper_value = bper_value.strip()
-                            if bper_value:
-                                bper_dict[bper_value] = {  # BPER dict initialization
-                                    'SCC': scc_name,
-                                    'BPER name': bper_value,
-                                    'Approval Status': '',
-                                    'Valid to': '',
-                                    'Gathered': False,
-                                    'TLA': ''
-                                }
-
-            elif 'documentation' in header: # check header for this text and grab all document names
-                for cell in sheet.iter_rows(min_row=2, max_row=1000, min_col=col_index, max_col=col_index, values_only=True):
-                    if cell[0] is not None:
-                        cell_value_str = str(cell[0])
-                        doc_names = re.split(r'\s{2,}|\r?\n', cell_value_str) # create a list with all the document names
-                        for doc_name in doc_names:
-                            doc_name_for_comparison = doc_name.replace('\n', '').strip().upper()  # Normalize case for comparison
-
-                            if doc_name_for_comparison in ['NA', 'N/A', 'NO', 'NONE']: # handles placeholders
-                                continue
-
-                            attestation_match = attestation_pattern.search(doc_name) # attestation logic placed here because they end up in this column
-                            if attestation_match:
-                                attestation_num = attestation_match.group() # adds all attestations that match the pattern
-                                if attestation_num not in attestation_dict:
-                                    attestation_dict[attestation_num] = { # attestation dict initialization
-                                        'SCC': scc_name,
-                                        'Attestation num': attestation_num,
-                                        'Gathered': False,
-                                        'Approval Status': '',
-                                        'Valid to': ''
-                                    }
-                            else:
-                                doc_name_final = re.sub(r'\b\d{6}\b', '', doc_name).strip()
-                                if doc_name_final and doc_name_final not in doc_dict:
-                                    doc_dict[doc_name_final] = { # supporting document ditc initialization
-                                        'SCC': scc_name,
-                                        'Doc name': doc_name_final,
-                                        'Version':'',
-                                        'Last update': '',
-                                        'Gathered': False                                        
-                                    }
-
-            elif 'method' in header: # finds the method column 
-                for row_index, row in enumerate(sheet.iter_rows(min_row=2, max_row=1000, min_col=col_index, max_col=col_index, values_only=True), start=2):
-                    if row[0] is not None: # grabs them all unless its blank
-                        method = str(row[0])
-                        stig_id_cell = sheet.cell(row=row_index, column=1)
-                        stig_id = str(stig_id_cell.value)
-                        method_dict[stig_id] = { # check method dict initialization
-                            'SCC': scc_name,
-                            'STIG ID': stig_id,
-                            'Evidence Method': method,
-                            'compliant': '',
-                            'Gathered': False
-                        }
-            col_index += 1
+        rows = sheet.iter_rows(values_only=True) # every row is read once, top to bottom
+        header_row = next(rows, None)
+        header_index[sheet_name] = SCCHEADERS.build_sheet_index(header_row) # the header row is only read here
+        if not header_row:
+            continue
+
+        column_roles = header_index[sheet_name]['column roles']
+        if not column_roles:
+            continue
+        last_rows = {col_index: 1 for col_index, role in column_roles} # real data extent of each column, found while reading
+
+        rows_scanned = 1
+        for row_index, row in enumerate(rows, start=2): # read to the end of the sheet's data, however long it is
+            rows_scanned = row_index
+            for col_index, role in column_roles: # hand each cell to the extractor for its column
+                cell_value = row[col_index] if col_index < len(row) else None
+                if cell_value is None:
+                    continue
+                last_rows[col_index] = row_index
+
+                if role == 'exception':
+                    if cell_value: # check header for this text and grab all BPER names
+                        extract_bpers(cell_value, scc_name, bper_dict)
+                elif role == 'documentation': # grab all document names
+                    extract_documents(cell_value, scc_name, doc_dict, attestation_dict)
+                else: # grabs all compliance methods, keyed by the STIG ID in the first column
+                    extract_method(row[0] if row else None, cell_value, scc_name, method_dict)
+
+        sheet_stats[sheet_name] = {
+            'Rows scanned': rows_scanned,
+            'Last row': {f"{role} (column {col_index + 1})": last_rows[col_index] for col_index, role in column_roles}
+        }
+        print(f"  {sheet_name}: scanned {rows_scanned} rows, data ends at row {max(last_rows.values())}")
 
     return bper_dict, doc_dict, attestation_dict, method_dict
 
@@ -3,73 +3,110 @@ import re
 import fitz 
 import argparse
 import sys
+import FILECACHE
 
-def check_already_processed(input_pdf, bper_input_directory): # check to skip processing if BPERs have already been sliced
+manifest_filename = 'split_manifest.json' # lives in the BPER directory, what each bundle was split into last time
 
-    if "BPER" not in os.path.basename(input_pdf).upper(): # skips anything without BPER in the name
-        print(f"Skipping {input_pdf} (does not contain 'BPER')")
-        return False
-    
-    pdf_document = fitz.open(input_pdf)
-    print(f"Checking {input_pdf}")  # Display check status
-    first_three_bpers = set()
-    for page in pdf_document:
-        if "TDL Control:" in page.get_text():
-            bper_name = extract_bper_text(page.get_text()).upper()
-            first_three_bpers.add(bper_name)
-            if len(first_three_bpers) == 3:
-                break
-    pdf_document.close()
+def load_manifest(directory_path):
+    return FILECACHE.load_json(os.path.join(directory_path, manifest_filename), {'Bundles': {}}, 'split manifest') # a bad manifest just means every bundle gets split again
+
+def save_manifest(directory_path, manifest):
+    FILECACHE.save_json(os.path.join(directory_path, manifest_filename), manifest)
 
-    for bper in first_three_bpers: # check BPER directory for those filenames
-        if not os.path.exists(os.path.join(bper_input_directory, f'{bper}.pdf')):
-            return False
-    return True
+def get_uppercase_filename(filename): # the name process_directory gives every file in the BPER directory
+    name, extension = os.path.splitext(filename)
+    return name.upper() + extension.lower()
+
+def find_missing_outputs(manifest_entry, output_directory): # outputs of an unchanged bundle that have to be written again, ones changed since they were split out (like a newer BPER dropped in by hand) are kept and their new fingerprint recorded
+    missing_outputs = []
+    for output, output_entry in manifest_entry['outputs'].items():
+        output_path = os.path.join(output_directory, output)
+        if not os.path.exists(output_path):
+            missing_outputs.append(output)
+        elif not FILECACHE.is_unchanged(output_path, output_entry):
+            print(f"Keeping {output}, it was changed after it was split out")
+            manifest_entry['outputs'][output] = FILECACHE.get_fingerprint(output_path)
+    return missing_outputs
 
 def extract_bper_text(page_text): # Search for 'BPER' XXXXXXX from pdf
     match = re.search(r'BPER\d+', page_text)
     return match.group(0) if match else 'rename_me' # file output as rename_me if it can't find a BPER name
 
-def split_pdf(input_pdf): # Split a PDF into separate files based on 'TDL Control:' markers
-    if check_already_processed(input_pdf, os.path.dirname(input_pdf)):
-        print(f"{os.path.basename(input_pdf)}: already split") #skip if already split
-        return
-    else:
-        print(f"Splitting {os.path.basename(input_pdf)}")
-
-    pdf_document = fitz.open(input_pdf)
-    current_output = None
-    output_name = None
-
-    for page in pdf_document: 
-        page_text = page.get_text() # pull out text from every page until >
-
+def find_bper_ranges(pdf_document): # first pass, (BPER name, first page, last page) for every BPER in a bundle, each page's text is read once
+    bper_starts = []
+    for page in pdf_document:
+        page_text = page.get_text()
         if "TDL Control:" in page_text: # best phrase I could find for separation
-            if current_output:
-                current_output.save(os.path.join(os.path.dirname(input_pdf), f'{output_name.upper()}.pdf')) # save this file and start a new one
-            current_output = fitz.open()  
-            output_name = extract_bper_text(page_text) # name from extract_bper_text
+            bper_starts.append((extract_bper_text(page_text).upper(), page.number)) # name from extract_bper_text
 
-        if current_output is not None:
-            current_output.insert_pdf(pdf_document, from_page=page.number, to_page=page.number) # adds pages without TDL control to current_output, building new file
+    bper_ranges = []
+    for i, (bper_name, start_page) in enumerate(bper_starts): # a BPER runs up to the page before the next TDL Control, the last one to the end of the bundle
+        end_page = bper_starts[i + 1][1] - 1 if i + 1 < len(bper_starts) else pdf_document.page_count - 1
+        bper_ranges.append((bper_name, start_page, end_page))
+    return bper_ranges
 
-    if current_output:
-        current_output.save(os.path.join(os.path.dirname(input_pdf), f'{output_name.upper()}.pdf')) # makes sure last file is saved, bc no separator
+def write_bper_ranges(pdf_document, bper_ranges, output_directory): # second pass, one ranged insert_pdf per BPER instead of one per page
+    for bper_name, start_page, end_page in bper_ranges:
+        current_output = fitz.open()
+        current_output.insert_pdf(pdf_document, from_page=start_page, to_page=end_page)
+        current_output.save(os.path.join(output_directory, f'{bper_name}.pdf'))
+        current_output.close()
 
-    pdf_document.close()
+def split_pdf(input_pdf, manifest_entry=None, keep_existing=False): # Split a PDF into separate files based on 'TDL Control:' markers, pages before the first marker are left out. keep_existing only writes BPERs that aren't in the folder, returns the bundle's new manifest entry
+    output_directory = os.path.dirname(input_pdf)
+    pdf_document = fitz.open(input_pdf)
+    try:
+        bper_ranges = {f'{bper_name}.pdf': (bper_name, start_page, end_page) for bper_name, start_page, end_page in find_bper_ranges(pdf_document)} # a BPER in the bundle twice ends up as its last copy
+        if keep_existing:
+            outputs_to_write = [output for output in bper_ranges if not os.path.exists(os.path.join(output_directory, output))]
+            print(f"{os.path.basename(input_pdf)}: writing {len(outputs_to_write)} missing BPER(s)")
+        else:
+            outputs_to_write = list(bper_ranges)
+            print(f"Splitting {os.path.basename(input_pdf)} into {len(bper_ranges)} BPER(s)")
+        write_bper_ranges(pdf_document, [bper_ranges[output] for output in outputs_to_write], output_directory)
+    finally:
+        pdf_document.close()
+
+    outputs = dict(manifest_entry['outputs']) if manifest_entry else {}
+    for output in bper_ranges:
+        if output in outputs_to_write or output not in outputs:
+            outputs[output] = FILECACHE.get_fingerprint(os.path.join(output_directory, output))
+    bundle_entry = FILECACHE.get_fingerprint(input_pdf)
+    bundle_entry['outputs'] = outputs
+    return bundle_entry
 
-def process_directory(directory_path): # Process all PDFs in a directory for splitting and renaming
+def process_directory(directory_path, cancel_event=None): # Process all PDFs in a directory for splitting and renaming, bundles the manifest says are unchanged and fully split aren't opened, bundles not reached before cancel_event is set are left for next time
     print(f"Processing directory: {directory_path}")
+    manifest = load_manifest(directory_path)
+    bundles = {} # only bundles still in the directory stay in the manifest
+    split_outputs = {output for manifest_entry in manifest['Bundles'].values() for output in manifest_entry['outputs']} # like RENAME_ME.pdf, which isn't a bundle either
     for filename in os.listdir(directory_path):
-        if filename.lower().endswith(".pdf") and not re.match(r"BPER\d+.pdf", filename, re.IGNORECASE):
-            split_pdf(os.path.join(directory_path, filename))
+        if filename.lower().endswith(".pdf") and not re.match(r"BPER\d+.pdf", filename, re.IGNORECASE) and get_uppercase_filename(filename) not in split_outputs:
+            input_pdf = os.path.join(directory_path, filename)
+            bundle_name = get_uppercase_filename(filename) # what the bundle is called after the rename below
+            manifest_entry = manifest['Bundles'].get(bundle_name)
+            if cancel_event is not None and cancel_event.is_set(): # left for the next run, what the manifest knows about it is kept
+                if manifest_entry is not None:
+                    bundles[bundle_name] = manifest_entry
+                continue
+            if manifest_entry is None: # not split since the manifest was added, BPERs already in the folder are kept like before
+                bundles[bundle_name] = split_pdf(input_pdf, keep_existing=True)
+            elif not FILECACHE.is_unchanged(input_pdf, manifest_entry): # new revision of the bundle, everything in it is written again
+                bundles[bundle_name] = split_pdf(input_pdf)
+            elif find_missing_outputs(manifest_entry, directory_path):
+                bundles[bundle_name] = split_pdf(input_pdf, manifest_entry, keep_existing=True)
+            else:
+                print(f"{filename}: already split") #skip if already split
+                bundles[bundle_name] = manifest_entry
     
     for filename in os.listdir(directory_path):
-        name, extension = os.path.splitext(filename)
-        uppercase_filename = name.upper() + extension.lower()  # Rename file to uppercase
-        if filename != uppercase_filename:
+        uppercase_filename = get_uppercase_filename(filename)  # Rename file to uppercase
+        if filename != uppercase_filename and filename != manifest_filename:
             os.rename(os.path.join(directory_path, filename), os.path.join(directory_path, uppercase_filename))
 
+    manifest['Bundles'] = bundles
+    save_manifest(directory_path, manifest)
+
 if __name__ == "__main__": # Command-line interface to specify directory for PDF processing
     parser = argparse.ArgumentParser(description='Process all PDFs in a directory.')
     parser.add_argument('DirectoryPath', metavar='directory_path', type=str, help='The path to the directory containing PDF files')
@@ -1,27 +1,135 @@
 import os
 import json
 import re
-import fitz
 import SCCCHECK
+import SCCCACHE
+import PDFCACHE
+import FILECACHE
 import FILEGRAB
+import time
+import queue
+import multiprocessing
 from datetime import datetime
-from difflib import SequenceMatcher
 
-def update_bper_info(bper_dict, base_directories): # grab info for BPERs and write to dict
-    for key, value_list in bper_dict.items(): # goes through every item in every bper entry
+default_pdf_workers = os.cpu_count() or 1 # worker processes reading BPER and attestation PDFs, 'PDF Workers' in Program Settings, 0 reads them in this process with no timeout
+default_pdf_timeout = 120 # seconds one PDF gets before its worker is killed and the PDF counts as failed, 'PDF Timeout' in Program Settings
+pdf_error_fields = {'BPER': ("N/A", "Status: Error", False), 'Attestation': ("Status: Error", "N/A", "N/A", "N/A", "N/A")} # what the extractors give back for a PDF they couldn't read
+
+def track_items(items, item_done=None, cancel_event=None): # stops handing out items once the pull is cancelled, item_done is called after each one is finished
+    for item in items:
+        if cancel_event is not None and cancel_event.is_set():
+            return
+        yield item
+        if item_done:
+            item_done()
+
+def find_pdf(key, value, directory_index): # path of the PDF for one BPER or attestation entry, None if it isn't there
+    if 'manually_linked' in value:
+        file_path = value['manually_linked'] # use manually_linked path if assigned
+        return file_path if os.path.isfile(file_path) else None
+    return FILEGRAB.find_indexed_file(directory_index, f"{key}.pdf") # otherwise look up the name + .pdf in the index
+
+def extract_pdf(pdf_job): # runs in a worker process, returns (fields, stats), anything that goes wrong comes back as the extractor's error values so one bad PDF can't take the pool down
+    extractor, file_path = pdf_job
+    stats = {} # pages read and pages in the PDF, BPERs only
+    try:
+        if extractor == 'BPER':
+            return FILEGRAB.extract_BPER_info(file_path, stats), stats
+        return FILEGRAB.extract_attestation_pdf_info(file_path), stats
+    except Exception as e:
+        print(f"Error processing {file_path}: {e}")
+        return pdf_error_fields[extractor], stats
+
+def find_uncached_pdfs(bper_dict, attestation_dict, directory_indexes, pdf_cache=None): # every PDF the pull will read, split into cached fields and (extractor, path) jobs still to extract
+    extracted = {}
+    pdf_jobs = []
+    seen_jobs = set() # each PDF is looked up once, however many SCCs list it
+    for extractor, item_dict, index_key in (('BPER', bper_dict, 'bper'), ('Attestation', attestation_dict, 'attestation')):
+        for key, value_list in item_dict.items():
+            for value in value_list:
+                if value.get('false_positive', False):
+                    continue
+                file_path = find_pdf(key, value, directory_indexes[index_key])
+                pdf_job = (extractor, file_path)
+                if not file_path or pdf_job in seen_jobs:
+                    continue
+                seen_jobs.add(pdf_job)
+                fields = PDFCACHE.get_extracted(pdf_cache, file_path, extractor) if pdf_cache is not None else None
+                if fields is None:
+                    pdf_jobs.append(pdf_job)
+                else:
+                    extracted[pdf_job] = fields
+    return extracted, pdf_jobs
+
+def extract_pdfs(pdf_jobs, workers=1, timeout=default_pdf_timeout, item_done=None, cancel_event=None, pdf_stats=None): # {(extractor, path): fields}, each worker holds one PDF at a time so a hung one is caught by its deadline and its worker killed, fills pdf_stats with each PDF's stats if given
+    extracted = {}
+    if pdf_stats is None:
+        pdf_stats = {}
+    if not pdf_jobs:
+        return extracted
+    if workers <= 0: # opted out of the pool, a PDF that hangs or crashes MuPDF takes this process with it
+        for pdf_job in track_items(pdf_jobs, item_done, cancel_event):
+            extracted[pdf_job], pdf_stats[pdf_job] = extract_pdf(pdf_job)
+        return extracted
+
+    workers = min(workers, len(pdf_jobs))
+    pending = list(pdf_jobs)
+    running = {} # pdf_job -> deadline
+    finished = queue.Queue()
+    pool = multiprocessing.Pool(workers)
+    try:
+        while pending or running:
+            if cancel_event is not None and cancel_event.is_set():
+                break
+            while pending and len(running) < workers: # never more jobs than workers, so a job's clock starts when it's handed out
+                pdf_job = pending.pop(0)
+                running[pdf_job] = time.monotonic() + timeout
+                pool.apply_async(extract_pdf, (pdf_job,), callback=lambda result, pdf_job=pdf_job: finished.put((pdf_job, result)))
+
+            try:
+                pdf_job, (fields, stats) = finished.get(timeout=max(0, min(min(running.values()) - time.monotonic(), 0.5))) # wakes up at least twice a second to check for a cancel
+            except queue.Empty:
+                timed_out = [pdf_job for pdf_job, deadline in running.items() if deadline <= time.monotonic()]
+                if timed_out: # a worker that's stuck (or crashed) can't be stopped on its own, so the pool goes and the other running PDFs start again
+                    for pdf_job in timed_out:
+                        print(f"Timed out reading {pdf_job[1]} after {timeout} seconds")
+                        del running[pdf_job]
+                        extracted[pdf_job] = pdf_error_fields[pdf_job[0]]
+                        if item_done:
+                            item_done()
+                    pool.terminate()
+                    pool.join()
+                    pending = list(running) + pending
+                    running = {}
+                    pool = multiprocessing.Pool(workers)
+                continue
+
+            if pdf_job in running: # results from a pool that was replaced are ignored, the job was handed out again
+                del running[pdf_job]
+                extracted[pdf_job] = fields
+                pdf_stats[pdf_job] = stats
+                if item_done:
+                    item_done()
+    finally:
+        pool.terminate() # nothing is left running after a cancel or an error
+        pool.join()
+    return extracted
+
+def update_bper_info(bper_dict, base_directories, directory_indexes=None, item_done=None, cancel_event=None, pdf_cache=None, extracted=None): # grab info for BPERs and write to dict, pdf_cache skips PDFs read on an earlier pull, extracted has fields already read by extract_pdfs
+    if directory_indexes is None:
+        directory_indexes = FILEGRAB.build_directory_indexes(base_directories)
+
+    for key, value_list in track_items(bper_dict.items(), item_done, cancel_event): # goes through every item in every bper entry
         for value in value_list:
             if value.get('false_positive', False):
                 print(f"Skipping BPER '{key}' marked as false positive.") # skip if marked as false pos
                 continue
 
-            if 'manually_linked' in value:
-                file_path = value['manually_linked'] # use manually_linked path if assigned
-            else:
-                source_directory = base_directories['bper']
-                file_path = os.path.join(source_directory, f"{key}.pdf")
+            file_path = find_pdf(key, value, directory_indexes['bper'])
 
-            if os.path.isfile(file_path):
-                valid_to_date, approval_status, tla_present = FILEGRAB.extract_BPER_info(file_path) # ***FIX*** Counterintuitively, the actual pulling of information comes from the FILEGRAB file; just where it started, hasn't been fixed yet. 
+            if file_path:
+                fields = extracted.get(('BPER', file_path)) if extracted else None
+                valid_to_date, approval_status, tla_present = fields or PDFCACHE.extract_bper_info(file_path, pdf_cache) # ***FIX*** Counterintuitively, the actual pulling of information comes from the FILEGRAB file; just where it started, hasn't been fixed yet. 
                 value['Valid to'] = valid_to_date # write these values to the dictionaries
                 value['Approval Status'] = approval_status
                 value['TLA'] = tla_present
@@ -40,26 +148,21 @@ def convert_datetime_to_string(obj): # file starts throwing errors unless the da
         return obj.isoformat()
     return obj
 
-def update_attestation_info(attestation_dict, base_directories): # improved attestation info grabbing 
-    for key, value_list in attestation_dict.items():
+def update_attestation_info(attestation_dict, base_directories, directory_indexes=None, item_done=None, cancel_event=None, pdf_cache=None, extracted=None): # improved attestation info grabbing, pdf_cache skips PDFs read on an earlier pull, extracted has fields already read by extract_pdfs
+    if directory_indexes is None:
+        directory_indexes = FILEGRAB.build_directory_indexes(base_directories)
+
+    for key, value_list in track_items(attestation_dict.items(), item_done, cancel_event):
         for value in value_list: # skip the fals positives
             if value.get('false_positive', False):
                 print(f"Skipping Attestation '{key}' marked as false positive.")
                 continue
 
-            if 'manually_linked' in value: # use manually linked file path if set
-                file_path = value['manually_linked']
-            else:
-                source_directory = base_directories['attestation'] # otherwise use the attestation directory + attestation name + .pdf
-                file_path = os.path.join(source_directory, f"{key}.pdf")
-
-            if os.path.isfile(file_path):
-                with fitz.open(file_path) as doc:
-                    text = ""
-                    for page in doc:
-                        text += page.get_text() # if doc exists in directory, look through every page
+            file_path = find_pdf(key, value, directory_indexes['attestation']) # manually linked file if set, otherwise attestation name + .pdf in the attestation directory
 
-                approval_status, valid_to_date, review_date, assessment_date, overall_status = FILEGRAB.extract_attest_info(text) # use FILEGRAB extract attestation info 
+            if file_path:
+                fields = extracted.get(('Attestation', file_path)) if extracted else None
+                approval_status, valid_to_date, review_date, assessment_date, overall_status = fields or PDFCACHE.extract_attestation_info(file_path, pdf_cache) # if doc exists in directory, use FILEGRAB extract attestation info on every page
                 if approval_status != "Status: Error": # as long as there is no error, write the values to the dictionary
                     value['Approval Status'] = approval_status
                     value['Valid to'] = valid_to_date
@@ -74,8 +177,15 @@ def update_attestation_info(attestation_dict, base_directories): # improved atte
             else:
                 print(f"File not found for Attestation: {key}")
 
-def update_doc_info(doc_dict, base_directories): # grab info for documents and write to dict
-    for doc_name, value_list in doc_dict.items(): # goes through every item in every document entry
+def update_doc_info(doc_dict, base_directories, directory_indexes=None, match_cache=None, item_done=None, cancel_event=None): # grab info for documents and write to dict, match_cache is the 'Document Matches' dict from progress.json
+    if match_cache is None:
+        match_cache = {} # still saves matching the same name again for every SCC that lists it
+    if directory_indexes is None:
+        directory_indexes = FILEGRAB.build_directory_indexes(base_directories)
+    doc_files = FILEGRAB.list_indexed_files(directory_indexes['doc'], ignore_case=False) # has to handle additional file types
+    doc_match_index = FILEGRAB.build_match_index(doc_files, ignore_case=False) # same matcher as gathering, case sensitive here
+
+    for doc_name, value_list in track_items(doc_dict.items(), item_done, cancel_event): # goes through every item in every document entry
         for value in value_list:
             if value.get('false_positive', False):
                 print(f"Skipping Document '{value['Doc name']}' marked as false positive.") # skip if marked as false pos
@@ -83,14 +193,14 @@ def update_doc_info(doc_dict, base_directories): # grab info for documents and w
 
             if 'manually_linked' in value:
                 file_path = value['manually_linked'] # use manually_linked path if assigned
+                if not os.path.isfile(file_path):
+                    file_path = None
             else:
-                source_directory = base_directories['doc']
-                matching_files = [f for f in os.listdir(source_directory) if (f.endswith('.docx') or f.endswith('.doc') or f.endswith('.xlsx') or f.endswith('.xls') or f.endswith('.pdf'))] # has to handle additional file types
+                matching_files = doc_files
                 if matching_files:
-                    best_match = max(matching_files, key=lambda x: SequenceMatcher(None, doc_name, x).ratio())
-                    match_ratio = SequenceMatcher(None, doc_name, best_match).ratio()
-                    if match_ratio >= 0.8:
-                        file_path = os.path.join(source_directory, best_match) # matching for document names
+                    best_match, match_ratio = FILEGRAB.find_cached_match(match_cache, doc_match_index, doc_name, 0.8)
+                    if best_match:
+                        file_path = FILEGRAB.find_indexed_file(directory_indexes['doc'], best_match) # matching for document names, the index knows the subfolder after a recursive scan
                     else:
                         print(f"No close match found for Document: {doc_name}") # no matches better than the ratio
                         continue
@@ -98,7 +208,7 @@ def update_doc_info(doc_dict, base_directories): # grab info for documents and w
                     print(f"No matching file found for Document: {doc_name}") # no matches at all
                     continue
 
-            if os.path.isfile(file_path):
+            if file_path:
                 most_recent_date = FILEGRAB.extract_Doc_info(file_path) # ***FIX*** Counterintuitively, the actual pulling of information comes from the FILEGRAB file; just where it started, hasn't been fixed yet.
                 if most_recent_date:
                     for entry in value_list: # write these values to dictionaries
@@ -114,14 +224,16 @@ def extract_version(filename): # grabs the version number, according to WPS nami
     version_match = re.search(r'_(\d{2})(?=\.docx$|\.doc$)', filename)
     return version_match.group(1) if version_match else ''
 
-def update_scc_info(scc_dict, scc_dir): # compares version numbers, then runs scc check if there is a newer version
-    for file_path, scc_info in scc_dict.items():
+def update_scc_info(scc_dict, scc_dir, scc_cache=None, item_done=None, cancel_event=None): # compares version numbers, then runs scc check if there is a newer version
+    scc_files = [file_info['name'] for file_info in FILEGRAB.index_directory(scc_dir)['files'].values()] # list the SCC directory once for every SCC
+
+    for file_path, scc_info in track_items(scc_dict.items(), item_done, cancel_event):
         # Extract the SCC name from the file path
         scc_name = os.path.splitext(os.path.basename(file_path))[0]
         scc_name = re.sub(r'_\d+$', '', scc_name)  # Remove the version number from the SCC name
 
         # Search for files with a similar name pattern in the specified directory
-        matching_files = [f for f in os.listdir(scc_dir) if f.startswith(scc_name) and f.endswith('.xlsx')]
+        matching_files = [f for f in scc_files if f.startswith(scc_name) and f.endswith('.xlsx')]
 
         if matching_files:
             try:
@@ -143,7 +255,10 @@ def update_scc_info(scc_dict, scc_dir): # compares version numbers, then runs sc
                         print(f"Skipping SCC file {latest_file} as it has a version less than or equal to the stored version.")
                         continue
 
-            updated_scc_info = SCCCHECK.process_scc_file(latest_file_path) # run SCC check
+            if scc_cache is not None:
+                updated_scc_info = SCCCACHE.process_scc_file(latest_file_path, scc_cache) # run SCC check, unless this file was already checked
+            else:
+                updated_scc_info = SCCCHECK.process_scc_file(latest_file_path) # run SCC check
             directory_built = scc_info.get('Directory built', False)
             scc_info.update(updated_scc_info)
             scc_info['Directory built'] = directory_built
@@ -151,7 +266,7 @@ def update_scc_info(scc_dict, scc_dir): # compares version numbers, then runs sc
         else:
             print(f"No matching SCC files found for: {scc_name}")
 
-def update_progress_info(progress_file, base_directories=None, scc_dir=None): # writing the dictionaries to progress.json
+def update_progress_info(progress_file, base_directories=None, scc_dir=None, progress=None, cancel_event=None): # writing the dictionaries to progress.json, progress(done, total) is called after each item, returns False if cancel_event stopped the pull part way
     with open(progress_file, 'r') as file:
         progress_data = json.load(file)
     
@@ -159,14 +274,43 @@ def update_progress_info(progress_file, base_directories=None, scc_dir=None): #
     bper_dict = progress_data.get('BPERs', {})
     attestation_dict = progress_data.get('Attestations', {})
     doc_dict = progress_data.get('Documents', {})
+    program_settings = progress_data.get('Program Settings', {})
+
+    total = (len(bper_dict) + len(attestation_dict) + len(doc_dict) if base_directories else 0) + (len(scc_dict) if scc_dir else 0)
+    done = 0
+    def item_done():
+        nonlocal done
+        done += 1
+        if progress:
+            progress(done, total)
     
     if base_directories:
-        update_bper_info(bper_dict, base_directories)
-        update_attestation_info(attestation_dict, base_directories)
-        update_doc_info(doc_dict, base_directories)
+        recursive_scan = program_settings.get('Recursive Source Scan', False) # source folders can be nested trees
+        directory_indexes = FILEGRAB.build_directory_indexes(base_directories, recursive_scan) # each source directory is listed once for the whole pull
+        pdf_cache = PDFCACHE.load_cache(os.path.dirname(progress_file)) # BPER and attestation PDFs rarely change between pulls
+        extracted, pdf_jobs = find_uncached_pdfs(bper_dict, attestation_dict, directory_indexes, pdf_cache)
+        total += len(pdf_jobs)
+        pdf_workers = program_settings.get('PDF Workers', default_pdf_workers)
+        pdf_timeout = program_settings.get('PDF Timeout', default_pdf_timeout)
+        pdf_stats = {}
+        for pdf_job, fields in extract_pdfs(pdf_jobs, pdf_workers, pdf_timeout, item_done, cancel_event, pdf_stats).items(): # the CPU heavy part, spread over worker processes
+            extracted[pdf_job] = fields
+            PDFCACHE.store_result(pdf_cache, pdf_job[1], pdf_job[0], fields)
+        bper_stats = [stats for stats in pdf_stats.values() if stats]
+        if bper_stats: # BPERs stop reading once every field is found
+            print(f"BPER pages read: {sum(stats['Pages read'] for stats in bper_stats)} of {sum(stats['Pages'] for stats in bper_stats)} across {len(bper_stats)} BPERs")
+
+        update_bper_info(bper_dict, base_directories, directory_indexes, item_done, cancel_event, pdf_cache, extracted)
+        update_attestation_info(attestation_dict, base_directories, directory_indexes, item_done, cancel_event, pdf_cache, extracted)
+        FILECACHE.save_cache(pdf_cache)
+        update_doc_info(doc_dict, base_directories, directory_indexes, progress_data.setdefault('Document Matches', {}), item_done, cancel_event) # matches from earlier runs are reused
     
     if scc_dir:
-        update_scc_info(scc_dict, scc_dir)
+        scc_cache = SCCCACHE.load_cache(os.path.dirname(progress_file))
+        update_scc_info(scc_dict, scc_dir, scc_cache, item_done, cancel_event)
+        FILECACHE.save_cache(scc_cache)
+
+    cancelled = cancel_event is not None and cancel_event.is_set()
     
     # write new data to dictionaries
     progress_data['BPERs'] = bper_dict
@@ -174,11 +318,15 @@ def update_progress_info(progress_file, base_directories=None, scc_dir=None): #
     progress_data['Documents'] = doc_dict
     progress_data['SCC'] = scc_dict
 
-    program_settings = progress_data.get('Program Settings', {})
-    program_settings['Pull Info Date'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    if not cancelled: # a cancelled pull keeps what it finished but doesn't count as a pull
+        program_settings['Pull Info Date'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     progress_data['Program Settings'] = program_settings
     
     with open(progress_file, 'w') as file:
         json.dump(convert_datetime_to_string(progress_data), file, indent=4) # datetime objects > strings
     
+    if cancelled:
+        print(f"Pull cancelled after {done} of {total} items, finished items were saved.")
+        return False
     print("Progress information updated successfully.")
+    return True
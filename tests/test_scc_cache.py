@@ -0,0 +1,19 @@
+import json
+import SCCCHECK
+import SCCCACHE
+import FILECACHE
+from test_stale_dimensions import write_scc
+
+def test_cached_check_from_older_scccheck_is_redone(tmp_path, monkeypatch):
+    file_path = str(tmp_path / "TEAM001_SCC_01.xlsx")
+    write_scc(file_path)
+
+    cache = SCCCACHE.load_cache(str(tmp_path))
+    SCCCACHE.process_scc_file(file_path, cache)
+    FILECACHE.save_cache(cache)
+    with open(cache['path'], 'r') as file:
+        assert json.load(file)['Check version'] == SCCCHECK.check_version
+
+    assert SCCCACHE.load_cache(str(tmp_path))['entries'] # same checker, the entry is kept
+    monkeypatch.setattr(SCCCHECK, 'check_version', SCCCHECK.check_version + 1)
+    assert SCCCACHE.load_cache(str(tmp_path))['entries'] == {} # newer checker, the old check is thrown out
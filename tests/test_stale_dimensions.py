@@ -0,0 +1,57 @@
+import re
+import zipfile
+import openpyxl
+import SCCREAD
+import SCCCHECK
+
+def write_scc(file_path, rows=200): # small SCC with data well past the dimension the stale copy claims
+    workbook = openpyxl.Workbook()
+    title_sheet = workbook.active
+    title_sheet.title = "Title Page"
+    title_sheet.cell(row=1, column=1, value="Security Configuration Checklist")
+    title_sheet.cell(row=3, column=2, value="SCM1234")
+    title_sheet.cell(row=20, column=1, value="SCC System Scope: all member servers")
+
+    sheet = workbook.create_sheet("Checklist")
+    sheet.append(["STIG ID", "Exception ID", "Compliance Method", "Documentation"])
+    for row_number in range(rows):
+        sheet.append([
+            f"STIG-{row_number:05d}",
+            f"BPER{row_number:07d}" if row_number % 10 == 0 else None,
+            "Manual",
+            f"Supporting Document {row_number % 7}    {100000 + row_number}"
+        ])
+    workbook.save(file_path)
+
+def write_stale_copy(file_path, stale_path, ref="A1:C2"): # same workbook with every sheet's <dimension> rewritten, like exports that never update it
+    with zipfile.ZipFile(file_path) as source, zipfile.ZipFile(stale_path, 'w', zipfile.ZIP_DEFLATED) as target:
+        for item in source.infolist():
+            data = source.read(item.filename)
+            if item.filename.startswith('xl/worksheets/'):
+                data = re.sub(rb'<dimension ref="[^"]*"', b'<dimension ref="' + ref.encode() + b'"', data)
+            target.writestr(item, data)
+
+def test_process_excel_file_ignores_stale_dimension(tmp_path):
+    file_path = str(tmp_path / "TEAM001_SCC_01.xlsx")
+    stale_path = str(tmp_path / "TEAM002_SCC_01.xlsx")
+    write_scc(file_path)
+    write_stale_copy(file_path, stale_path)
+
+    expected = SCCREAD.process_excel_file(file_path)
+    results = SCCREAD.process_excel_file(stale_path)
+
+    assert [len(result) for result in results] == [len(result) for result in expected]
+    assert [len(result) for result in results] == [20, 7, 200, 200]
+
+def test_process_scc_file_ignores_stale_dimension(tmp_path):
+    file_path = str(tmp_path / "TEAM001_SCC_01.xlsx")
+    stale_path = str(tmp_path / "TEAM001_SCC_02.xlsx")
+    write_scc(file_path)
+    write_stale_copy(file_path, stale_path, "A1:A1")
+
+    expected = SCCCHECK.process_scc_file(file_path)
+    scc_info = SCCCHECK.process_scc_file(stale_path)
+
+    assert scc_info['SCM Name'] == expected['SCM Name'] == "SCM1234"
+    assert scc_info['SCC System Scope Presence'] and expected['SCC System Scope Presence'] # row 20 of the title page
+    assert scc_info['Exception column presence'] and scc_info['Compliance method column presence'] and scc_info['WPS config sup doc presence']